@@ -1,18 +1,27 @@
 import streamlit as st
-import chromadb
-from sentence_transformers import SentenceTransformer
-from transformers import pipeline
 import json
 import re
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib import colors
-import io
-from docx import Document
-from docx.shared import Inches
-from docx.enum.text import WD_ALIGN_PARAGRAPH
+import threading
+import time
+from config import (
+    GENERATION_BATCH_SIZE, BATCHED_GENERATION, STREAMING_GENERATION, RETRIEVER_BACKEND, WARMUP_MODELS,
+    EXPORT_PRERENDER, PARALLEL_SECTIONS, SECTION_EXECUTION_MODE, SECTION_WORKERS, SECTION_TORCH_THREADS,
+    SECTION_TIMEOUT_SECONDS, GENERATOR_MODEL, GENERATOR_BACKEND, ONNX_MODEL_PATH, DEBUG_METRICS, METRICS_FILE,
+    CONTEXT_BUDGETING, CONTEXT_DEDUP_THRESHOLD, CONTEXT_MMR_LAMBDA, SECTION_TOKEN_BUDGETS,
+    SECTION_RETRIEVAL, SECTION_N_RESULTS, INCREMENTAL_GENERATION, USE_GENERATION_SCHEDULER
+)
+from context import build_context, build_section_contexts
+from executor import SectionExecutor
+from incremental import plan_regeneration, section_input_key, update_store
+from metrics import registry
+from models import build_collection, build_models, build_retriever, generator_residency
+from residency import process_memory
+from retrieval import retrieve_for_sections
+from skills import extract_skills
+from startup_profile import load_timings, record_load
+from cache import CachedGenerator
+from export import cached_export, export_resume, format_text_resume, pending_export, submit_export
+from generation import SECTION_TYPES, generate_section, generate_sections_batched, remove_duplicates, stream_section, unwrap_pipeline
 
 # Page configuration
 st.set_page_config(
@@ -68,187 +77,96 @@ st.markdown("""
 @st.cache_resource
 def load_models():
     """Load and cache the embedding and generation models"""
-    embedder = SentenceTransformer("all-MiniLM-L6-v2")
-    generator = pipeline("text2text-generation", model="google/flan-t5-large")
-    return embedder, generator
+    return build_models()
 
 @st.cache_resource
 def setup_chromadb():
     """Setup and cache ChromaDB connection"""
-    client = chromadb.PersistentClient(path="./data")
-    collection = client.get_or_create_collection(name="resume_blocks")
-    return collection
+    return build_collection()
 
-def extract_skills_from_query(query):
-    """Extract potential skills from the job query"""
-    skill_keywords = {
-        'python': 'Python', 'javascript': 'JavaScript', 'java': 'Java', 'react': 'React',
-        'node.js': 'Node.js', 'aws': 'AWS', 'docker': 'Docker', 'kubernetes': 'Kubernetes',
-        'machine learning': 'Machine Learning', 'ml': 'Machine Learning', 'ai': 'AI',
-        'data science': 'Data Science', 'sql': 'SQL', 'nosql': 'NoSQL',
-        'git': 'Git', 'agile': 'Agile', 'scrum': 'Scrum', 'devops': 'DevOps',
-        'frontend': 'Frontend', 'backend': 'Backend', 'full-stack': 'Full-Stack',
-        'cloud': 'Cloud Computing', 'microservices': 'Microservices'
-    }
-    
-    found_skills = []
-    query_lower = query.lower()
-    for keyword, skill in skill_keywords.items():
-        if keyword in query_lower:
-            found_skills.append(skill)
-    
-    return found_skills
+@st.cache_resource
+def setup_retriever():
+    """Setup and cache the configured retrieval backend"""
+    if RETRIEVER_BACKEND == "numpy":
+        return build_retriever()
+    return build_retriever(setup_chromadb())
 
-def create_pdf_resume(resume_data):
-    """Create a PDF resume"""
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter)
-    story = []
-    
-    # Get styles
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=16,
-        spaceAfter=12,
-        textColor=colors.darkblue
-    )
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=14,
-        spaceAfter=8,
-        textColor=colors.darkblue
+@st.cache_resource
+def load_section_executor():
+    """Create and cache the worker pool for concurrent section generation"""
+    generator = load_models()[1] if SECTION_EXECUTION_MODE == "thread" else None
+    return SectionExecutor(
+        generator,
+        mode=SECTION_EXECUTION_MODE,
+        workers=SECTION_WORKERS,
+        torch_threads=SECTION_TORCH_THREADS,
+        model_name=GENERATOR_MODEL,
+        backend=GENERATOR_BACKEND,
+        onnx_path=ONNX_MODEL_PATH
     )
-    normal_style = styles['Normal']
-    
-    # Add title
-    story.append(Paragraph("Professional Resume", title_style))
-    story.append(Spacer(1, 12))
-    
-    # Add sections
-    sections = [
-        ("Professional Summary", resume_data.get("summary", "")),
-        ("Work Experience", resume_data.get("experience", "")),
-        ("Technical Skills", resume_data.get("skills", "")),
-        ("Key Projects", resume_data.get("projects", "")),
-        ("Education", resume_data.get("education", ""))
-    ]
-    
-    for section_title, content in sections:
-        if content:
-            story.append(Paragraph(section_title, heading_style))
-            story.append(Paragraph(content, normal_style))
-            story.append(Spacer(1, 12))
-    
-    doc.build(story)
-    buffer.seek(0)
-    return buffer
 
-def create_docx_resume(resume_data):
-    """Create a DOCX resume"""
-    doc = Document()
-    
-    # Add title
-    title = doc.add_heading('Professional Resume', 0)
-    title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    
-    # Add sections
-    sections = [
-        ("Professional Summary", resume_data.get("summary", "")),
-        ("Work Experience", resume_data.get("experience", "")),
-        ("Technical Skills", resume_data.get("skills", "")),
-        ("Key Projects", resume_data.get("projects", "")),
-        ("Education", resume_data.get("education", ""))
-    ]
-    
-    for section_title, content in sections:
-        if content:
-            doc.add_heading(section_title, level=1)
-            doc.add_paragraph(content)
-            doc.add_paragraph()  # Add spacing
+@st.cache_resource
+def start_warmup():
+    """Load models and run a dummy inference on a background thread, once per process"""
+    def warm_up():
+        embedder, generator = load_models()
+        setup_retriever()
+        with record_load("warm-up inference"):
+            embedder.encode("warm up")
+            generator("warm up", max_length=8)
     
-    # Save to buffer
-    buffer = io.BytesIO()
-    doc.save(buffer)
-    buffer.seek(0)
-    return buffer
+    thread = threading.Thread(target=warm_up, name="model-warmup", daemon=True)
+    thread.start()
+    return thread
 
-def remove_duplicates(text):
-    """Remove duplicate sentences and clean up the text"""
-    if not text:
-        return text
-    
-    # Split by sentences and remove duplicates
-    sentences = text.split('. ')
-    seen = set()
-    unique_sentences = []
-    
-    for sentence in sentences:
-        sentence = sentence.strip()
-        if sentence and sentence not in seen:
-            unique_sentences.append(sentence)
-            seen.add(sentence)
-    
-    # Join back with proper punctuation
-    result = '. '.join(unique_sentences)
-    if result and not result.endswith('.'):
-        result += '.'
-    
-    return result
+def extract_skills_from_query(query):
+    """Extract potential skills from the job query"""
+    return extract_skills(query)
+
+EXPORT_FORMATS = {
+    "pdf": ("📋 Download as PDF", "application/pdf", "Download as PDF document"),
+    "docx": (
+        "📝 Download as DOCX",
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        "Download as Word document"
+    ),
+}
 
-def generate_resume_section(job_role, context, section_type="summary", generator=None):
+@st.fragment
+def render_export_download(resume_data, job_role, fmt):
+    """Render a document only when requested; reruns only this fragment, not the page"""
+    label, mime, help_text = EXPORT_FORMATS[fmt]
+    data = cached_export(resume_data, fmt)
+    if data is None and pending_export(resume_data, fmt) is not None:
+        # A pre-render is already running; wait for it rather than asking for a click
+        with st.spinner(f"Preparing {fmt.upper()}..."):
+            data = export_resume(resume_data, fmt)
+    if data is None and st.button(f"⚙️ Prepare {fmt.upper()}", key=f"prepare_{fmt}"):
+        data = export_resume(resume_data, fmt)
+    if data is not None:
+        st.download_button(
+            label=label,
+            data=data,
+            file_name=f"resume_{job_role.replace(' ', '_').lower()}.{fmt}",
+            mime=mime,
+            help=help_text
+        )
+
+def generate_resume_section(job_role, context, section_type="summary", generator=None,
+                            experience_level=None, industry=None):
     """Generate different types of resume sections"""
-    
-    prompts = {
-        "summary": f"""Write a concise, professional summary for a resume targeting the job role: {job_role}. 
-        Use the context below to create a compelling summary that highlights relevant skills and experience. 
-        Make it sound professional and avoid repetition. Context: {context}""",
-        
-        "experience": f"""Create 3-4 unique bullet points describing relevant work experience for a {job_role} role. 
-        Each bullet should be specific and highlight different achievements or responsibilities. 
-        Use the context below and avoid repeating phrases. Context: {context}""",
-        
-        "skills": f"""List technical skills and competencies relevant for a {job_role} position. 
-        Organize them by category (e.g., Programming Languages, Frameworks, Tools). 
-        Use the context below and avoid listing the same skill multiple times. Context: {context}""",
-        
-        "projects": f"""Describe 2-3 unique projects relevant for a {job_role} role. 
-        Each project should have a clear description of the technology used and outcomes achieved. 
-        Use the context below and avoid repetition. Context: {context}""",
-        
-        "education": f"""Write an education section appropriate for a {job_role} position. 
-        Include relevant degrees, certifications, and any specialized training. 
-        Use the context below and avoid repetition. Context: {context}"""
-    }
-    
     if generator is None:
         _, generator = load_models()
     
-    prompt = prompts.get(section_type, prompts["summary"])
-    
-    # Generate with better parameters
-    response = generator(
-        prompt, 
-        max_length=400, 
-        do_sample=True, 
-        temperature=0.8,
-        top_p=0.9,
-        repetition_penalty=1.2
-    )[0]["generated_text"]
-    
-    # Clean up the response
-    cleaned_response = remove_duplicates(response)
-    return cleaned_response
+    return generate_section(job_role, context, section_type, generator, experience_level, industry)
 
 def main():
     # Header
     st.markdown('<h1 class="main-header">💼 RAG Resume Generator</h1>', unsafe_allow_html=True)
     
-    # Load models and setup
-    embedder, generator = load_models()
-    collection = setup_chromadb()
+    # Models load on first Generate click; optionally warm them up in the background
+    if WARMUP_MODELS:
+        start_warmup()
     
     # Sidebar for configuration
     with st.sidebar:
@@ -275,6 +193,14 @@ def main():
             help="Select your target industry"
         )
         
+        # Unchanged sections are reused by default; this asks for fresh versions of all of them
+        regenerate_all = st.checkbox(
+            "🔄 Regenerate all sections",
+            value=not INCREMENTAL_GENERATION,
+            disabled=not INCREMENTAL_GENERATION,
+            help="Generate new versions even of sections whose inputs did not change"
+        )
+        
         # Generate button
         generate_btn = st.button("🚀 Generate Resume", type="primary")
     
@@ -282,6 +208,10 @@ def main():
     if job_role and generate_btn:
         st.markdown("---")
         
+        # Load models and setup
+        embedder, generator = load_models()
+        retriever = setup_retriever()
+        
         # Extract skills from query
         detected_skills = extract_skills_from_query(job_role)
         
@@ -293,61 +223,167 @@ def main():
         
         # Query the RAG system
         query_embedding = embedder.encode(job_role)
-        results = collection.query(
-            query_embeddings=[query_embedding], 
-            n_results=8
-        )
-        
-        # Combine context
-        context = " ".join([doc for result in results["documents"] for doc in result])
+        context_stats = {}
+        if SECTION_RETRIEVAL:
+            # One category- and seniority-filtered query per section instead of one shared context
+            section_results = retrieve_for_sections(
+                retriever, query_embedding, n_results=SECTION_N_RESULTS, with_embeddings=CONTEXT_BUDGETING,
+                experience_level=experience_level
+            )
+            results = section_results["summary"]
+            context = {}
+            for section_type, section_result in section_results.items():
+                if CONTEXT_BUDGETING:
+                    context[section_type], context_stats[section_type] = build_context(
+                        section_result["documents"][0],
+                        section_result["embeddings"][0],
+                        query_embedding,
+                        SECTION_TOKEN_BUDGETS[section_type],
+                        tokenizer=getattr(unwrap_pipeline(generator), "tokenizer", None),
+                        dedup_threshold=CONTEXT_DEDUP_THRESHOLD,
+                        mmr_lambda=CONTEXT_MMR_LAMBDA
+                    )
+                else:
+                    context[section_type] = " ".join(section_result["documents"][0])
+        else:
+            results = retriever.query(
+                query_embeddings=[query_embedding], 
+                n_results=8,
+                with_embeddings=CONTEXT_BUDGETING
+            )
+            
+            # Combine context
+            context = " ".join([doc for result in results["documents"] for doc in result])
+            if CONTEXT_BUDGETING:
+                # Per-section contexts: deduplicated, optionally reranked, packed into a token budget
+                context, context_stats = build_section_contexts(
+                    results["documents"][0],
+                    results["embeddings"][0],
+                    query_embedding,
+                    SECTION_TOKEN_BUDGETS,
+                    tokenizer=getattr(unwrap_pipeline(generator), "tokenizer", None),
+                    dedup_threshold=CONTEXT_DEDUP_THRESHOLD,
+                    mmr_lambda=CONTEXT_MMR_LAMBDA
+                )
         
-        # Generate different resume sections
+        # Lay out a header and an empty placeholder for every section
         col1, col2 = st.columns(2)
-        
+        placeholders = {}
         with col1:
             st.markdown('<h3 class="section-header">📋 Professional Summary</h3>', unsafe_allow_html=True)
-            summary = generate_resume_section(job_role, context, "summary", generator)
-            st.markdown(f'<div class="resume-section">{summary}</div>', unsafe_allow_html=True)
+            placeholders["summary"] = st.empty()
             
             st.markdown('<h3 class="section-header">💼 Work Experience</h3>', unsafe_allow_html=True)
-            experience = generate_resume_section(job_role, context, "experience", generator)
-            st.markdown(f'<div class="resume-section">{experience}</div>', unsafe_allow_html=True)
+            placeholders["experience"] = st.empty()
             
             st.markdown('<h3 class="section-header">🎓 Education</h3>', unsafe_allow_html=True)
-            education = generate_resume_section(job_role, context, "education", generator)
-            st.markdown(f'<div class="resume-section">{education}</div>', unsafe_allow_html=True)
+            placeholders["education"] = st.empty()
         
         with col2:
             st.markdown('<h3 class="section-header">🛠️ Technical Skills</h3>', unsafe_allow_html=True)
-            skills = generate_resume_section(job_role, context, "skills", generator)
-            st.markdown(f'<div class="resume-section">{skills}</div>', unsafe_allow_html=True)
+            placeholders["skills"] = st.empty()
             
             st.markdown('<h3 class="section-header">🚀 Key Projects</h3>', unsafe_allow_html=True)
-            projects = generate_resume_section(job_role, context, "projects", generator)
-            st.markdown(f'<div class="resume-section">{projects}</div>', unsafe_allow_html=True)
+            placeholders["projects"] = st.empty()
+        
+        # Only regenerate sections whose prompt inputs changed since the last run
+        if SECTION_RETRIEVAL:
+            section_block_ids = {section_type: section_results[section_type]["ids"][0] for section_type in SECTION_TYPES}
+        else:
+            section_block_ids = {section_type: results["ids"][0] for section_type in SECTION_TYPES}
+        input_keys = {
+            section_type: section_input_key(
+                section_type, job_role, section_block_ids[section_type], experience_level, industry, GENERATOR_MODEL
+            )
+            for section_type in SECTION_TYPES
+        }
+        store = st.session_state.setdefault("generated_sections", {})
+        if INCREMENTAL_GENERATION and not regenerate_all:
+            sections, stale = plan_regeneration(store, input_keys)
+        else:
+            sections, stale = {}, list(SECTION_TYPES)
+        for section_type in sections:
+            placeholders[section_type].markdown(f'<div class="resume-section">{sections[section_type]}</div>', unsafe_allow_html=True)
+        
+        # Generate the stale sections: streamed token by token, concurrently, in one batch, or one call each
+        section_latency = {}
+        fresh = {}
+        if stale:
+            if STREAMING_GENERATION:
+                if USE_GENERATION_SCHEDULER:
+                    # Streaming drives the model directly, one section at a time
+                    st.warning("⚠️ Streaming bypasses the generation scheduler; sections are not batched with other sessions")
+                for section_type in stale:
+                    timings = {}
+                    text = ""
+                    for chunk in stream_section(job_role, context, section_type, generator, timings, experience_level, industry):
+                        text += chunk
+                        placeholders[section_type].markdown(f'<div class="resume-section">{text}</div>', unsafe_allow_html=True)
+                    fresh[section_type] = remove_duplicates(text)
+                    section_latency[section_type] = timings
+            elif PARALLEL_SECTIONS:
+                executor = load_section_executor()
+                stale_sections = executor.stale_count()
+                if stale_sections:
+                    st.warning(
+                        f"⏳ {stale_sections} timed-out section(s) from an earlier run are still running; "
+                        "new sections may wait for them"
+                    )
+                start = time.perf_counter()
+                fresh, timed_out = executor.generate(
+                    job_role, context, section_types=stale, timeout=SECTION_TIMEOUT_SECONDS,
+                    experience_level=experience_level, industry=industry
+                )
+                section_latency["sections (parallel)"] = {"total": time.perf_counter() - start}
+                if timed_out:
+                    st.warning(f"⏱️ Timed out generating: {', '.join(timed_out)}")
+            else:
+                if BATCHED_GENERATION:
+                    start = time.perf_counter()
+                    fresh = generate_sections_batched(
+                        job_role, context, generator, section_types=stale, batch_size=GENERATION_BATCH_SIZE,
+                        experience_level=experience_level, industry=industry
+                    )
+                    section_latency["sections (batched)"] = {"total": time.perf_counter() - start}
+                else:
+                    for section_type in stale:
+                        start = time.perf_counter()
+                        fresh[section_type] = generate_resume_section(
+                            job_role, context, section_type, generator, experience_level, industry
+                        )
+                        section_latency[section_type] = {"total": time.perf_counter() - start}
+        
+        update_store(store, input_keys, fresh)
+        sections.update(fresh)
+        skipped = len(SECTION_TYPES) - len(stale)
+        registry.increment("sections_reused_total", skipped)
+        registry.increment("sections_generated_total", len(stale))
+        
+        for section_type, placeholder in placeholders.items():
+            placeholder.markdown(f'<div class="resume-section">{sections[section_type]}</div>', unsafe_allow_html=True)
+        
+        summary = sections["summary"]
+        experience = sections["experience"]
+        skills = sections["skills"]
+        projects = sections["projects"]
+        education = sections["education"]
         
         # Full resume download
         st.markdown("---")
         st.markdown('<h3 class="section-header">📄 Complete Resume</h3>', unsafe_allow_html=True)
         
-        full_resume = f"""
-# Professional Resume
-
-## Professional Summary
-{summary}
-
-## Work Experience
-{experience}
-
-## Technical Skills
-{skills}
-
-## Key Projects
-{projects}
-
-## Education
-{education}
-        """
+        resume_data = {
+            "summary": summary,
+            "experience": experience,
+            "skills": skills,
+            "projects": projects,
+            "education": education
+        }
+        full_resume = format_text_resume(resume_data)
+        if EXPORT_PRERENDER:
+            # Render both documents on the export pool while the page finishes
+            for fmt in EXPORT_FORMATS:
+                submit_export(resume_data, fmt)
         
         st.text_area("Complete Resume", value=full_resume, height=400)
         
@@ -367,44 +403,86 @@ def main():
             )
         
         with col2:
-            # PDF Download
-            resume_data = {
-                "summary": summary,
-                "experience": experience,
-                "skills": skills,
-                "projects": projects,
-                "education": education
-            }
-            pdf_buffer = create_pdf_resume(resume_data)
-            st.download_button(
-                label="📋 Download as PDF",
-                data=pdf_buffer.getvalue(),
-                file_name=f"resume_{job_role.replace(' ', '_').lower()}.pdf",
-                mime="application/pdf",
-                help="Download as PDF document"
-            )
+            # PDF Download (rendered on demand)
+            render_export_download(resume_data, job_role, "pdf")
         
         with col3:
-            # DOCX Download
-            docx_buffer = create_docx_resume(resume_data)
-            st.download_button(
-                label="📝 Download as DOCX",
-                data=docx_buffer.getvalue(),
-                file_name=f"resume_{job_role.replace(' ', '_').lower()}.docx",
-                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                help="Download as Word document"
-            )
+            # DOCX Download (rendered on demand)
+            render_export_download(resume_data, job_role, "docx")
         
         # RAG Context Information
         with st.expander("🔍 RAG Context Information"):
             st.markdown("**Retrieved Context:**")
-            st.text(context[:500] + "..." if len(context) > 500 else context)
+            context_text = context["summary"] if isinstance(context, dict) else context
+            st.text(context_text[:500] + "..." if len(context_text) > 500 else context_text)
+            
+            if context_stats:
+                st.markdown("**Context budget (tokens before → after):**")
+                for section_type, stats in context_stats.items():
+                    st.text(
+                        f"{section_type}: {stats['tokens_before']} → {stats['tokens_after']} tokens, "
+                        f"{stats['blocks_before']} → {stats['blocks_after']} blocks"
+                    )
             
             st.markdown("**Query:**")
             st.text(job_role)
             
             st.markdown("**Number of retrieved documents:**")
             st.text(len(results["documents"][0]) if results["documents"] else 0)
+            
+            query_stats = embedder.stats()
+            st.markdown("**Query embedding cache:**")
+            st.text(f"hits {query_stats['hits']} | misses {query_stats['misses']} | entries {query_stats['entries']}/{query_stats['capacity']}")
+            
+            if isinstance(generator, CachedGenerator):
+                cache_stats = generator.cache.stats()
+                st.markdown("**Generation cache:**")
+                st.text(f"hits {cache_stats['hits']} | misses {cache_stats['misses']} | entries {cache_stats['entries']}")
+            
+            if load_timings:
+                st.markdown("**Startup profile:**")
+                st.text(" | ".join(f"{component} {seconds:.2f}s" for component, seconds in load_timings.items()))
+            
+            memory = process_memory()
+            if memory["rss_mb"] is not None:
+                st.markdown("**Process memory:**")
+                pss_text = f" | PSS {memory['pss_mb']:.0f} MiB" if memory["pss_mb"] is not None else ""
+                st.text(f"pid {memory['pid']} | RSS {memory['rss_mb']:.0f} MiB{pss_text} | models {', '.join(generator_residency.stats()['resident'])}")
+            
+            st.markdown("**Incremental generation:**")
+            st.text(f"{skipped} of {len(SECTION_TYPES)} sections reused, {len(stale)} regenerated")
+            
+            st.markdown("**Section latency:**")
+            for section_type, timings in section_latency.items():
+                ttft = timings.get("time_to_first_token")
+                ttft_text = f" | first token {ttft:.2f}s" if ttft is not None else ""
+                st.text(f"{section_type}: total {timings['total']:.2f}s{ttft_text}")
+        
+        # Pipeline metrics for this process
+        if DEBUG_METRICS:
+            with st.expander("📈 Pipeline Metrics"):
+                snapshot = registry.snapshot()
+                st.markdown("**Stage timings:**")
+                st.table([
+                    {
+                        "stage": stage,
+                        "calls": entry["count"],
+                        "mean ms": round(entry["sum"] / entry["count"] * 1000, 2),
+                        "max ms": round(entry["max"] * 1000, 2),
+                        "total s": round(entry["sum"], 3),
+                    }
+                    for stage, entry in sorted(snapshot["stages"].items())
+                ])
+                # Only time spent in the model counts, so cache hits do not inflate the rate
+                generate_seconds = snapshot["stages"].get("model_generate", {}).get("sum", 0.0)
+                generated_tokens = snapshot["counters"].get("generated_tokens_total", 0)
+                if generate_seconds:
+                    st.text(f"Generated tokens/sec: {generated_tokens / generate_seconds:.1f}")
+                st.markdown("**Counters and gauges:**")
+                st.json({**snapshot["counters"], **snapshot["gauges"]})
+        
+        if METRICS_FILE:
+            registry.write_prometheus_file(METRICS_FILE)
     
     elif not job_role:
         # Welcome message
@@ -0,0 +1,68 @@
+import json
+import os
+
+BACKENDS = ("pytorch", "int8", "onnx")
+
+def load_generator(model_name, backend="pytorch", onnx_path=None):
+    """Load a text2text-generation pipeline on the requested CPU inference backend
+
+    pytorch: the fp32 model as published
+    int8:    PyTorch dynamic int8 quantization of every Linear layer
+    onnx:    ONNX Runtime with KV-cache decoding, from a directory written by
+             export_model.py (or exported on the fly if onnx_path is empty)
+
+    Every backend returns a transformers pipeline, so callers use the same
+    generate interface regardless of the backend.
+    """
+    from transformers import AutoTokenizer, pipeline
+    
+    if backend == "pytorch":
+        return pipeline("text2text-generation", model=model_name)
+    
+    if backend == "int8":
+        import torch
+        from transformers import AutoModelForSeq2SeqLM
+        
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        return pipeline("text2text-generation", model=model, tokenizer=tokenizer)
+    
+    if backend == "onnx":
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+        
+        source = onnx_path or model_name
+        tokenizer = AutoTokenizer.from_pretrained(source)
+        model = ORTModelForSeq2SeqLM.from_pretrained(source, export=not onnx_path, use_cache=True)
+        return pipeline("text2text-generation", model=model, tokenizer=tokenizer)
+    
+    raise ValueError(f"Unknown generator backend '{backend}', expected one of {', '.join(BACKENDS)}")
+
+def weights_size_bytes(model_name):
+    """Size of a model's weights from its files on local disk (a directory or the Hugging Face cache), or None
+
+    Used to make room under the memory budget before a model is loaded. For
+    the int8 backend this is the fp32 size, which errs on the safe side.
+    """
+    def local_file(filename):
+        if os.path.isdir(model_name):
+            path = os.path.join(model_name, filename)
+            return path if os.path.isfile(path) else None
+        try:
+            from huggingface_hub import try_to_load_from_cache
+        except ImportError:
+            return None
+        path = try_to_load_from_cache(model_name, filename)
+        return path if isinstance(path, str) else None
+    
+    # Sharded checkpoints record their total size in the index
+    for index in ("model.safetensors.index.json", "pytorch_model.bin.index.json"):
+        path = local_file(index)
+        if path:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f).get("metadata", {}).get("total_size")
+    for filename in ("model.safetensors", "pytorch_model.bin"):
+        path = local_file(filename)
+        if path:
+            return os.path.getsize(path)
+    return None
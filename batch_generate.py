@@ -0,0 +1,229 @@
+"""Headless batch resume generation for large job-description feeds.
+
+Usage: python batch_generate.py jobs.jsonl --output-dir ./resumes --formats json pdf
+
+Each input line is a JSON object with a "job_role" (or "description") field and
+optional "id", "experience_level" and "industry" fields. Embedding, retrieval, generation and writing run as a
+pipeline of threads connected by bounded queues, so every stage works on a
+different job at once. Completed ids are appended to a checkpoint file, and a
+rerun after a crash skips them.
+"""
+import argparse
+import hashlib
+import json
+import os
+import queue
+import re
+import threading
+import time
+
+from config import GENERATION_BATCH_SIZE
+from export import create_docx_resume, create_pdf_resume, format_text_resume
+from generation import generate_sections_batched
+
+FORMATS = ("json", "txt", "pdf", "docx")
+CHECKPOINT_FILE = ".checkpoint"
+
+# Marks the end of the stream between stages
+_DONE = object()
+
+class StageStats:
+    """Items processed and busy time for one pipeline stage"""
+
+    def __init__(self, name):
+        self.name = name
+        self.items = 0
+        self.busy_seconds = 0.0
+
+    def throughput(self):
+        return self.items / self.busy_seconds if self.busy_seconds else 0.0
+
+def job_id(record, line_number):
+    """Use the record's id, or derive a stable one from the whole record"""
+    if record.get("id") is not None:
+        return str(record["id"])
+    # Every field (experience level, industry, ...) changes the output, so all of them go into the id
+    text = json.dumps(record, sort_keys=True, ensure_ascii=False) if record else str(line_number)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+def read_jobs(path, completed):
+    """Yield (id, job_role, record) for every job not already in the checkpoint"""
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if isinstance(record, str):
+                record = {"job_role": record}
+            jid = job_id(record, line_number)
+            if jid in completed:
+                continue
+            yield jid, record.get("job_role") or record.get("description", ""), record
+
+def load_checkpoint(output_dir):
+    path = os.path.join(output_dir, CHECKPOINT_FILE)
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+def safe_filename(jid):
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", jid)
+
+def write_outputs(output_dir, jid, job_role, record, sections, context, formats):
+    """Write one resume in every requested format"""
+    base = os.path.join(output_dir, safe_filename(jid))
+    if "json" in formats:
+        with open(base + ".json", "w", encoding="utf-8") as f:
+            json.dump({"id": jid, "job_role": job_role, "input": record, "context": context, "sections": sections}, f)
+    if "txt" in formats:
+        with open(base + ".txt", "w", encoding="utf-8") as f:
+            f.write(format_text_resume(sections))
+    if "pdf" in formats:
+        with open(base + ".pdf", "wb") as f:
+            f.write(create_pdf_resume(sections).getvalue())
+    if "docx" in formats:
+        with open(base + ".docx", "wb") as f:
+            f.write(create_docx_resume(sections).getvalue())
+
+def _run_stage(stats, inbox, outbox, work, errors):
+    """Apply work to every item from inbox and pass results to outbox"""
+    try:
+        while True:
+            item = inbox.get()
+            if item is _DONE:
+                break
+            start = time.perf_counter()
+            result = work(item)
+            stats.busy_seconds += time.perf_counter() - start
+            stats.items += len(item) if isinstance(item, list) else 1
+            for out in (result if isinstance(result, list) else [result]):
+                outbox.put(out)
+    except Exception as exc:
+        errors.append(exc)
+        # Keep draining so upstream stages never block on a full queue
+        while inbox.get() is not _DONE:
+            pass
+    finally:
+        outbox.put(_DONE)
+
+def generate_batch(jobs_path, output_dir, embedder, generator, retriever, formats=("json",),
+                   n_results=8, embed_batch_size=32, queue_size=64, generation_batch_size=GENERATION_BATCH_SIZE):
+    """Generate resumes for every job in a JSONL file and return per-stage statistics"""
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        raise ValueError(f"Unknown output formats: {', '.join(sorted(unknown))}")
+    os.makedirs(output_dir, exist_ok=True)
+    completed = load_checkpoint(output_dir)
+    
+    to_embed = queue.Queue(maxsize=queue_size)
+    to_retrieve = queue.Queue(maxsize=queue_size)
+    to_generate = queue.Queue(maxsize=queue_size)
+    to_write = queue.Queue(maxsize=queue_size)
+    stats = {name: StageStats(name) for name in ("embed", "retrieve", "generate", "write")}
+    errors = []
+    
+    def embed(batch):
+        vectors = embedder.encode_batch([job_role for _, job_role, _ in batch])
+        return [list(zip(batch, vectors))]
+    
+    def retrieve(batch):
+        results = retriever.query(query_embeddings=[vector for _, vector in batch], n_results=n_results)
+        return [
+            (job, " ".join(documents))
+            for (job, _), documents in zip(batch, results["documents"])
+        ]
+    
+    def generate(item):
+        (jid, job_role, record), context = item
+        sections = generate_sections_batched(
+            job_role, context, generator,
+            batch_size=generation_batch_size,
+            experience_level=record.get("experience_level"),
+            industry=record.get("industry")
+        )
+        return jid, job_role, record, sections, context
+    
+    threads = [
+        threading.Thread(target=_run_stage, args=(stats["embed"], to_embed, to_retrieve, embed, errors), daemon=True),
+        threading.Thread(target=_run_stage, args=(stats["retrieve"], to_retrieve, to_generate, retrieve, errors), daemon=True),
+        threading.Thread(target=_run_stage, args=(stats["generate"], to_generate, to_write, generate, errors), daemon=True),
+    ]
+    
+    def feed():
+        batch = []
+        try:
+            for job in read_jobs(jobs_path, completed):
+                batch.append(job)
+                if len(batch) >= embed_batch_size:
+                    to_embed.put(batch)
+                    batch = []
+            if batch:
+                to_embed.put(batch)
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            to_embed.put(_DONE)
+    
+    threads.append(threading.Thread(target=feed, daemon=True))
+    for thread in threads:
+        thread.start()
+    
+    # The writer runs on the calling thread and owns the checkpoint file
+    start = time.perf_counter()
+    with open(os.path.join(output_dir, CHECKPOINT_FILE), "a", encoding="utf-8") as checkpoint:
+        while True:
+            item = to_write.get()
+            if item is _DONE:
+                break
+            write_start = time.perf_counter()
+            jid, job_role, record, sections, context = item
+            write_outputs(output_dir, jid, job_role, record, sections, context, formats)
+            checkpoint.write(jid + "\n")
+            checkpoint.flush()
+            os.fsync(checkpoint.fileno())
+            stats["write"].busy_seconds += time.perf_counter() - write_start
+            stats["write"].items += 1
+    
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    
+    return {
+        "resumes": stats["write"].items,
+        "skipped": len(completed),
+        "seconds": time.perf_counter() - start,
+        "stages": {name: {"items": s.items, "busy_seconds": s.busy_seconds, "items_per_sec": s.throughput()}
+                   for name, s in stats.items()},
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("jobs", help="JSONL file of job descriptions")
+    parser.add_argument("--output-dir", default="./resumes")
+    parser.add_argument("--formats", nargs="+", default=["json"], choices=FORMATS)
+    parser.add_argument("--n-results", type=int, default=8)
+    parser.add_argument("--embed-batch-size", type=int, default=32)
+    parser.add_argument("--queue-size", type=int, default=64, help="max items waiting between two stages")
+    args = parser.parse_args()
+    
+    from models import build_models, build_retriever
+    
+    embedder, generator = build_models()
+    retriever = build_retriever()
+    stats = generate_batch(
+        args.jobs, args.output_dir, embedder, generator, retriever,
+        formats=args.formats,
+        n_results=args.n_results,
+        embed_batch_size=args.embed_batch_size,
+        queue_size=args.queue_size
+    )
+    
+    print(f"✅ Generated {stats['resumes']} resumes in {stats['seconds']:.1f}s ({stats['skipped']} already done)")
+    for name, stage in stats["stages"].items():
+        print(f"  {name:<9} {stage['items']:>7} items | {stage['items_per_sec']:.2f} items/sec busy")
+
+if __name__ == "__main__":
+    main()
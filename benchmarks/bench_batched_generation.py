@@ -0,0 +1,54 @@
+"""Compare sequential and batched generation of the five resume sections on CPU.
+
+Usage: python benchmarks/bench_batched_generation.py --model google/flan-t5-small --runs 3
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from transformers import pipeline
+
+from corpus import CONTEXT, JOB_ROLES
+from generation import SECTION_TYPES, generate_section, generate_sections_batched
+
+def run_sequential(generator):
+    return {section_type: generate_section(JOB_ROLES[0], CONTEXT, section_type, generator) for section_type in SECTION_TYPES}
+
+def run_batched(generator, batch_size):
+    return generate_sections_batched(JOB_ROLES[0], CONTEXT, generator, batch_size=batch_size)
+
+def time_runs(fn, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="google/flan-t5-large")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=5)
+    args = parser.parse_args()
+
+    generator = pipeline("text2text-generation", model=args.model, device=-1)
+
+    # Warm up once so both modes see loaded weights
+    run_sequential(generator)
+
+    sequential = time_runs(lambda: run_sequential(generator), args.runs)
+    batched = time_runs(lambda: run_batched(generator, args.batch_size), args.runs)
+
+    seq_mean = sum(sequential) / len(sequential)
+    batch_mean = sum(batched) / len(batched)
+    print(f"Model: {args.model} | runs: {args.runs} | batch size: {args.batch_size}")
+    print(f"Sequential: {seq_mean:.2f}s per resume")
+    print(f"Batched:    {batch_mean:.2f}s per resume")
+    print(f"Speedup:    {seq_mean / batch_mean:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Compare prompt tokens and generation latency with full vs token-budgeted context.
+
+Usage: python benchmarks/bench_context_budget.py --model google/flan-t5-small --n-results 16
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from config import SECTION_TOKEN_BUDGETS
+from context import build_section_contexts, count_tokens
+from corpus import JOB_ROLES
+from generation import SECTION_TYPES, build_prompt, generate_sections_batched
+from load_data import resume_blocks
+from standins import HashingEmbedder
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="google/flan-t5-large")
+    parser.add_argument("--embedder", default="all-MiniLM-L6-v2", help="SentenceTransformer name, or 'hashing'")
+    parser.add_argument("--n-results", type=int, default=16)
+    parser.add_argument("--mmr-lambda", type=float, default=None)
+    args = parser.parse_args()
+    
+    from transformers import pipeline
+    generator = pipeline("text2text-generation", model=args.model, device=-1)
+    if args.embedder == "hashing":
+        embedder = HashingEmbedder()
+    else:
+        from sentence_transformers import SentenceTransformer
+        embedder = SentenceTransformer(args.embedder, device="cpu")
+    
+    block_vectors = np.asarray(embedder.encode(resume_blocks), dtype=np.float32)
+    block_vectors /= np.linalg.norm(block_vectors, axis=1, keepdims=True)
+    
+    totals = {"full": [0, 0.0], "budgeted": [0, 0.0]}
+    for job_role in JOB_ROLES:
+        query = np.asarray(embedder.encode(job_role), dtype=np.float32)
+        top = np.argsort(-(block_vectors @ (query / np.linalg.norm(query))))[:args.n_results]
+        documents = [resume_blocks[i] for i in top]
+        
+        full_context = " ".join(documents)
+        budgeted_context, _ = build_section_contexts(
+            documents, block_vectors[top], query, SECTION_TOKEN_BUDGETS,
+            tokenizer=generator.tokenizer, mmr_lambda=args.mmr_lambda
+        )
+        for label, context in (("full", full_context), ("budgeted", budgeted_context)):
+            prompts = [build_prompt(job_role, context, section_type) for section_type in SECTION_TYPES]
+            totals[label][0] += sum(count_tokens(prompts, generator.tokenizer))
+            start = time.perf_counter()
+            generate_sections_batched(job_role, context, generator)
+            totals[label][1] += time.perf_counter() - start
+    
+    print(f"Model: {args.model} | retrieved blocks: {args.n_results} | budgets: {SECTION_TOKEN_BUDGETS}")
+    for label, (tokens, seconds) in totals.items():
+        print(
+            f"{label:>9}: {tokens / len(JOB_ROLES):.0f} prompt tokens per resume | "
+            f"{seconds / len(JOB_ROLES):.2f}s per resume"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Compare tokens generated, tokens kept after de-duplication and latency per section with and without decoding control.
+
+Modes: baseline (max_length=400, duplicates removed afterwards), controlled (per-section
+token caps and early stopping) and, with --draft, controlled plus assisted decoding.
+Greedy decoding is used throughout so the modes are comparable.
+Usage: python benchmarks/bench_decoding_control.py --model google/flan-t5-large --draft google/flan-t5-small
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from config import SECTION_MAX_NEW_TOKENS, SECTION_MAX_UNITS
+from corpus import CONTEXT, JOB_ROLES
+from decoding import DecodingController
+from generation import GREEDY_GENERATION_KWARGS, SECTION_TYPES, build_prompt, remove_duplicates, section_kwargs
+
+def count_tokens(tokenizer, text):
+    return len(tokenizer(text, add_special_tokens=False)["input_ids"])
+
+def run_mode(generator, tokenizer, runs):
+    """Generate every section runs times and return per-section token counts and mean latency"""
+    results = {}
+    for section_type in SECTION_TYPES:
+        prompt = build_prompt(JOB_ROLES[0], CONTEXT, section_type)
+        kwargs = dict(GREEDY_GENERATION_KWARGS, **section_kwargs(generator, section_type))
+        generator(prompt, **kwargs)  # warm-up
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            text = generator(prompt, **kwargs)[0]["generated_text"]
+            timings.append(time.perf_counter() - start)
+        results[section_type] = {
+            "generated": count_tokens(tokenizer, text),
+            "kept": count_tokens(tokenizer, remove_duplicates(text)),
+            "seconds": sum(timings) / len(timings),
+        }
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="google/flan-t5-large")
+    parser.add_argument("--draft", default="", help="small draft model for assisted decoding, e.g. google/flan-t5-small")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    from backends import load_generator
+    pipe = load_generator(args.model)
+    modes = {
+        "baseline": pipe,
+        "controlled": DecodingController(pipe, SECTION_MAX_NEW_TOKENS, SECTION_MAX_UNITS),
+    }
+    if args.draft:
+        draft = load_generator(args.draft).model
+        modes["assisted"] = DecodingController(pipe, SECTION_MAX_NEW_TOKENS, SECTION_MAX_UNITS, assistant_model=draft)
+
+    print(f"{'mode':>10} {'section':>10} {'generated':>10} {'kept':>6} {'wasted':>7} {'latency s':>10}")
+    for mode, generator in modes.items():
+        results = run_mode(generator, pipe.tokenizer, args.runs)
+        for section_type, result in results.items():
+            print(
+                f"{mode:>10} {section_type:>10} {result['generated']:>10} {result['kept']:>6} "
+                f"{result['generated'] - result['kept']:>7} {result['seconds']:>10.2f}"
+            )
+        total = sum(result["seconds"] for result in results.values())
+        print(f"{mode:>10} {'total':>10} {'':>10} {'':>6} {'':>7} {total:>10.2f}")
+
+if __name__ == "__main__":
+    main()
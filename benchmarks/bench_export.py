@@ -0,0 +1,77 @@
+"""Measure PDF/DOCX export throughput for many resumes.
+
+Usage: python benchmarks/bench_export.py --resumes 1000
+"""
+import argparse
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import export
+
+def make_resume(i):
+    return {
+        "summary": f"Experienced engineer #{i} with a track record of shipping reliable backend services.",
+        "experience": "Built REST APIs in Python and Flask. Led migration to Kubernetes. Mentored junior developers.",
+        "skills": "Programming Languages: Python, SQL. Frameworks: Flask, React. Tools: Docker, Git.",
+        "projects": "Resume generator using RAG. Real-time analytics dashboard with Kafka and Plotly.",
+        "education": "Bachelor's degree in Computer Science. Certified AWS Solutions Architect.",
+    }
+
+def rate(label, count, fn):
+    start = time.perf_counter()
+    for i in range(count):
+        fn(i)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {count / elapsed:>9.1f} resumes/sec")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=1000)
+    args = parser.parse_args()
+
+    resumes = [make_resume(i) for i in range(args.resumes)]
+
+    def pdf_rebuilding_styles(i):
+        # What every call paid before styles were built once per process
+        export._pdf_styles.cache_clear()
+        export.create_pdf_resume(resumes[i])
+
+    def docx_original_builder(i):
+        # The builder as it was before the template: a fresh Document() and title per call
+        from docx import Document
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+        
+        doc = Document()
+        title = doc.add_heading('Professional Resume', 0)
+        title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        for section_title, key in export.RESUME_SECTIONS:
+            content = resumes[i].get(key, "")
+            if content:
+                doc.add_heading(section_title, level=1)
+                doc.add_paragraph(content)
+                doc.add_paragraph()
+        doc.save(io.BytesIO())
+
+    rate("PDF, styles rebuilt per call", args.resumes, pdf_rebuilding_styles)
+    rate("PDF, precompiled styles", args.resumes, lambda i: export.create_pdf_resume(resumes[i]))
+    rate("DOCX, original builder", args.resumes, docx_original_builder)
+    rate("DOCX, precompiled template", args.resumes, lambda i: export.create_docx_resume(resumes[i]))
+
+    export.EXPORT_CACHE_SIZE = args.resumes * 2
+    for i in range(args.resumes):
+        export.export_resume(resumes[i], "pdf")
+    rate("PDF, memoized repeat", args.resumes, lambda i: export.export_resume(resumes[i], "pdf"))
+
+    start = time.perf_counter()
+    export.EXPORT_CACHE_SIZE = 0
+    futures = [export.submit_export(resume, "docx", workers=4) for resume in resumes]
+    for future in futures:
+        future.result()
+    print(f"{'DOCX, 4-thread export pool':<34} {args.resumes / (time.perf_counter() - start):>9.1f} resumes/sec")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Compare cold and warm resume latency with the persistent generation cache.
+
+Usage: python benchmarks/bench_generation_cache.py --model google/flan-t5-small
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from transformers import pipeline
+
+from cache import CachedGenerator, GenerationCache
+from corpus import CONTEXT, JOB_ROLES
+from generation import generate_sections_batched
+
+def time_requests(generator):
+    timings = []
+    for job_role in JOB_ROLES:
+        start = time.perf_counter()
+        generate_sections_batched(job_role, CONTEXT, generator)
+        timings.append(time.perf_counter() - start)
+    return sum(timings) / len(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="google/flan-t5-large")
+    args = parser.parse_args()
+
+    pipe = pipeline("text2text-generation", model=args.model, device=-1)
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = GenerationCache(os.path.join(tmp, "generations.sqlite"))
+        generator = CachedGenerator(pipe, cache, args.model)
+
+        cold = time_requests(generator)
+        warm = time_requests(generator)
+
+        print(f"Model: {args.model}")
+        print(f"Cold request: {cold * 1000:.1f} ms")
+        print(f"Warm request: {warm * 1000:.1f} ms")
+        print(f"Cache stats:  {cache.stats()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Compare latency, RSS and output similarity of the generator backends.
+
+Each backend runs in its own subprocess so RSS numbers are not polluted by the others.
+Usage: python benchmarks/bench_generator_backends.py --model google/flan-t5-small --onnx-path ./models/flan-t5-small-onnx
+"""
+import argparse
+import difflib
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from corpus import CONTEXT, JOB_ROLES
+from generation import GREEDY_GENERATION_KWARGS, SECTION_TYPES, build_prompt
+
+def current_rss_mb():
+    """Resident set size of this process in MiB (Linux)"""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+def run_backend(model, backend, onnx_path, runs):
+    """Measure one backend in this process and return its results"""
+    from backends import load_generator
+    
+    start = time.perf_counter()
+    generator = load_generator(model, backend, onnx_path)
+    load_seconds = time.perf_counter() - start
+    
+    prompts = [build_prompt(JOB_ROLES[0], CONTEXT, section_type) for section_type in SECTION_TYPES]
+    # Greedy decoding so outputs can be compared across backends
+    generator(prompts[0], **GREEDY_GENERATION_KWARGS)
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        outputs = [generator(prompt, **GREEDY_GENERATION_KWARGS)[0]["generated_text"] for prompt in prompts]
+        timings.append(time.perf_counter() - start)
+    
+    return {
+        "backend": backend,
+        "load_seconds": load_seconds,
+        "resume_seconds": sum(timings) / len(timings),
+        "rss_mb": current_rss_mb(),
+        "outputs": outputs,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="google/flan-t5-large")
+    parser.add_argument("--backends", nargs="+", default=["pytorch", "int8", "onnx"])
+    parser.add_argument("--onnx-path", default="")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--single", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.single:
+        print(json.dumps(run_backend(args.model, args.single, args.onnx_path, args.runs)))
+        return
+    
+    results = []
+    for backend in args.backends:
+        command = [
+            sys.executable, os.path.abspath(__file__), "--single", backend,
+            "--model", args.model, "--onnx-path", args.onnx_path, "--runs", str(args.runs)
+        ]
+        output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    
+    reference = results[0]["outputs"]
+    print(f"{'backend':>8} {'load s':>8} {'resume s':>9} {'RSS MiB':>8} {'similarity':>11}")
+    for result in results:
+        similarity = sum(
+            difflib.SequenceMatcher(None, ref, out).ratio() for ref, out in zip(reference, result["outputs"])
+        ) / len(reference)
+        print(
+            f"{result['backend']:>8} {result['load_seconds']:>8.1f} {result['resume_seconds']:>9.2f} "
+            f"{result['rss_mb']:>8.0f} {similarity:>11.3f}"
+        )
+
+if __name__ == "__main__":
+    main()
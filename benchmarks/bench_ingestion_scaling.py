@@ -0,0 +1,52 @@
+"""Measure ingestion throughput with 1/2/4/8 encoding worker processes.
+
+Usage: python benchmarks/bench_ingestion_scaling.py --blocks 20000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chromadb
+from sentence_transformers import SentenceTransformer
+
+from corpus import synthetic_blocks
+from load_data import ingest, multi_process_encoder, single_process_encoder, start_encoder_pool
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--blocks", type=int, default=20000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--batch-size", type=int, default=4096)
+    parser.add_argument("--encode-batch-size", type=int, default=128)
+    parser.add_argument("--chunk-size", type=int, default=None)
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    args = parser.parse_args()
+
+    embed_model = SentenceTransformer(args.model, device="cpu")
+    results = []
+    for workers in args.workers:
+        with tempfile.TemporaryDirectory() as tmp:
+            collection = chromadb.PersistentClient(path=tmp).get_or_create_collection(name="resume_blocks")
+            pool = None
+            if workers > 1:
+                pool = start_encoder_pool(embed_model, workers)
+                encode = multi_process_encoder(embed_model, pool, args.encode_batch_size, args.chunk_size)
+            else:
+                encode = single_process_encoder(embed_model, args.encode_batch_size)
+            try:
+                stats = ingest(collection, encode, synthetic_blocks(args.blocks), batch_size=args.batch_size)
+            finally:
+                if pool is not None:
+                    embed_model.stop_multi_process_pool(pool)
+        results.append((workers, stats["seen"] / stats["seconds"]))
+
+    baseline = results[0][1]
+    print(f"{'workers':>8} {'blocks/sec':>12} {'speedup':>8}")
+    for workers, throughput in results:
+        print(f"{workers:>8} {throughput:>12.1f} {throughput / baseline:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Compare the memory footprint of N workers that each load the generator vs N workers forked after a preload.
+
+Every worker loads (or inherits) the weights, runs one inference and then reports
+its memory while all workers are alive. Summed PSS is the real footprint; RSS
+counts shared pages in every worker.
+Usage: python benchmarks/bench_model_residency.py --model google/flan-t5-small --workers 4
+       python benchmarks/bench_model_residency.py --stand-in-mb 512 --workers 4   (no model download)
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from residency import MIB, process_memory, share_after_fork
+
+def load_model(model_name, stand_in_mb):
+    if stand_in_mb:
+        import numpy as np
+        return np.random.default_rng(0).random(stand_in_mb * MIB // 8)
+    from backends import load_generator
+    return load_generator(model_name)
+
+def run_inference(model):
+    if callable(model):
+        model("Write a professional summary for a Python developer.", max_length=16)
+    else:
+        float(model.sum())
+
+def worker(model_name, stand_in_mb, results, ready, done):
+    """Load the model unless it was inherited from the parent, use it, then report memory"""
+    start = time.perf_counter()
+    model = _preloaded if _preloaded is not None else load_model(model_name, stand_in_mb)
+    load_seconds = time.perf_counter() - start
+    run_inference(model)
+    # Measure only once every worker holds its model, so shared pages are counted correctly
+    ready.wait()
+    results.put(dict(process_memory(), load_seconds=load_seconds))
+    done.wait()
+
+# Weights loaded by the parent in fork mode and inherited by the workers
+_preloaded = None
+
+def run_mode(mode, model_name, stand_in_mb, workers):
+    global _preloaded
+    parent_start = time.perf_counter()
+    if mode == "fork":
+        _preloaded = load_model(model_name, stand_in_mb)
+        share_after_fork(_preloaded)
+    preload_seconds = time.perf_counter() - parent_start
+
+    context = multiprocessing.get_context(mode)
+    results = context.Queue()
+    ready, done = context.Barrier(workers), context.Barrier(workers + 1)
+    processes = [
+        context.Process(target=worker, args=(model_name, stand_in_mb, results, ready, done))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    reports = [results.get() for _ in processes]
+    done.wait()
+    for process in processes:
+        process.join()
+
+    _preloaded = None
+    return preload_seconds, reports
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="google/flan-t5-large")
+    parser.add_argument("--stand-in-mb", type=int, default=0, help="use a random array of this size instead of a model")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"{'mode':>6} {'preload s':>10} {'worker load s':>14} {'RSS MiB':>9} {'PSS MiB':>9} {'shared MiB':>11}")
+    for mode in ("spawn", "fork"):
+        preload_seconds, reports = run_mode(mode, args.model, args.stand_in_mb, args.workers)
+        total = lambda field: sum(report[field] or 0 for report in reports)
+        print(
+            f"{mode:>6} {preload_seconds:>10.2f} {total('load_seconds') / len(reports):>14.2f} "
+            f"{total('rss_mb'):>9.0f} {total('pss_mb'):>9.0f} {total('shared_mb'):>11.0f}"
+        )
+    print("RSS/PSS/shared are summed over workers; worker load is the mean per worker")
+
+if __name__ == "__main__":
+    main()
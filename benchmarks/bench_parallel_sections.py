@@ -0,0 +1,59 @@
+"""Sweep workers x torch threads for concurrent section generation and report resume latency.
+
+Usage: python benchmarks/bench_parallel_sections.py --model google/flan-t5-small --workers 1 2 5 --threads 1 2 4
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from corpus import CONTEXT, JOB_ROLES
+
+def run_setting(model, mode, workers, threads, runs):
+    """Time one workers x threads setting in this process"""
+    from backends import load_generator
+    from executor import SectionExecutor
+    
+    generator = load_generator(model) if mode == "thread" else None
+    executor = SectionExecutor(generator, mode=mode, workers=workers, torch_threads=threads, model_name=model)
+    executor.generate(JOB_ROLES[0], CONTEXT)  # warm-up (and replica loading in process mode)
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        executor.generate(JOB_ROLES[0], CONTEXT)
+        timings.append(time.perf_counter() - start)
+    executor.shutdown()
+    return sum(timings) / len(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="google/flan-t5-large")
+    parser.add_argument("--mode", default="thread", choices=["thread", "process"])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 5])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--single", nargs=2, type=int, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.single:
+        print(run_setting(args.model, args.mode, args.single[0], args.single[1], args.runs))
+        return
+    
+    # Each setting runs in a fresh process because torch's thread count is process-wide
+    print(f"Cores: {os.cpu_count()} | model: {args.model} | mode: {args.mode}")
+    print(f"{'workers':>8} {'threads':>8} {'resume s':>9}")
+    for workers in args.workers:
+        for threads in args.threads:
+            command = [
+                sys.executable, os.path.abspath(__file__), "--model", args.model, "--mode", args.mode,
+                "--runs", str(args.runs), "--single", str(workers), str(threads)
+            ]
+            output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+            print(f"{workers:>8} {threads:>8} {float(output.strip().splitlines()[-1]):>9.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Compare p50/p99 query latency of the Chroma and NumPy retrieval backends.
+
+Build both from the same data first: python load_data.py --numpy-index ./data/numpy_index
+Usage: python benchmarks/bench_retrieval_backends.py --db-path ./data --index ./data/numpy_index
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chromadb
+import numpy as np
+
+from retrieval import ChromaRetriever, NumpyRetriever
+
+def percentiles(timings):
+    ms = np.asarray(timings) * 1000
+    return np.percentile(ms, 50), np.percentile(ms, 99)
+
+def time_queries(retriever, queries, n_results, batch):
+    timings = []
+    if batch:
+        start = time.perf_counter()
+        retriever.query(query_embeddings=queries, n_results=n_results)
+        return [(time.perf_counter() - start) / len(queries)]
+    for query in queries:
+        start = time.perf_counter()
+        retriever.query(query_embeddings=[query], n_results=n_results)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db-path", default="./data")
+    parser.add_argument("--index", default="./data/numpy_index")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--n-results", type=int, default=8)
+    args = parser.parse_args()
+
+    collection = chromadb.PersistentClient(path=args.db_path).get_or_create_collection(name="resume_blocks")
+    backends = {"chroma": ChromaRetriever(collection), "numpy": NumpyRetriever(args.index)}
+
+    # Random unit queries in the embedding space exercise the same code paths as real ones
+    rng = np.random.default_rng(0)
+    dim = backends["numpy"].embeddings.shape[1]
+    queries = rng.standard_normal((args.queries, dim)).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+    print(f"Corpus: {len(backends['numpy'].ids)} blocks | queries: {args.queries} | k={args.n_results}")
+    for name, retriever in backends.items():
+        time_queries(retriever, queries[:10].tolist(), args.n_results, batch=False)
+        p50, p99 = percentiles(time_queries(retriever, queries.tolist(), args.n_results, batch=False))
+        print(f"{name:>7}: p50 {p50:.3f} ms | p99 {p99:.3f} ms")
+    batched = time_queries(backends["numpy"], queries, args.n_results, batch=True)[0]
+    print(f"  numpy batched: {batched * 1000:.4f} ms per query")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Exercise the generation scheduler with concurrent callers and a stub generator.
+
+Usage: python benchmarks/bench_scheduler.py --sessions 16 --latency-ms 50
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generation import generate_sections_batched
+from scheduler import GenerationScheduler
+
+class StubGenerator:
+    """Pipeline stand-in whose cost is a fixed overhead per call plus a small per-prompt cost"""
+
+    def __init__(self, call_latency, prompt_latency):
+        self.call_latency = call_latency
+        self.prompt_latency = prompt_latency
+        # Model calls contend for the same CPU cores, so only one runs at a time
+        self._lock = threading.Lock()
+
+    def __call__(self, prompts, **kwargs):
+        if isinstance(prompts, str):
+            prompts = [prompts]
+        with self._lock:
+            time.sleep(self.call_latency + self.prompt_latency * len(prompts))
+        return [[{"generated_text": f"Generated for: {prompt[:40]}"}] for prompt in prompts]
+
+def run_sessions(generator, sessions):
+    def one_session(i):
+        return generate_sections_batched(f"Role {i}", "Some retrieved context.", generator)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        results = list(pool.map(one_session, range(sessions)))
+    return time.perf_counter() - start, results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=50, help="fixed cost per generator call")
+    parser.add_argument("--prompt-latency-ms", type=float, default=2, help="extra cost per prompt in a call")
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=20)
+    args = parser.parse_args()
+
+    stub = StubGenerator(args.latency_ms / 1000.0, args.prompt_latency_ms / 1000.0)
+    scheduler = GenerationScheduler(stub, max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms)
+
+    direct_time, _ = run_sessions(stub, args.sessions)
+    scheduled_time, results = run_sessions(scheduler, args.sessions)
+    assert all(len(sections) == 5 for sections in results)
+    scheduler.shutdown()
+
+    print(f"Sessions: {args.sessions}")
+    print(f"Direct calls:  {direct_time:.2f}s")
+    print(f"Scheduled:     {scheduled_time:.2f}s")
+    for name, value in scheduler.metrics().items():
+        print(f"  {name}: {value:.4f}" if isinstance(value, float) else f"  {name}: {value}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Compare two benchmark result files and flag regressions.
+
+Usage: python benchmarks/compare.py baseline.json candidate.json [--threshold 0.10]
+"""
+import argparse
+import json
+import sys
+
+# Metrics where a larger number is better; everything else is a latency
+HIGHER_IS_BETTER = ("blocks_per_sec",)
+
+def flatten(results, prefix=""):
+    flat = {}
+    for key, value in results.items():
+        if key == "meta":
+            continue
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, path + "."))
+        elif isinstance(value, (int, float)):
+            flat[path] = value
+    return flat
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative change counted as a regression")
+    args = parser.parse_args()
+    
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = flatten(json.load(f))
+    with open(args.candidate, encoding="utf-8") as f:
+        candidate = flatten(json.load(f))
+    
+    regressions = 0
+    print(f"{'metric':<48} {'baseline':>12} {'candidate':>12} {'change':>8}")
+    for metric in sorted(set(baseline) & set(candidate)):
+        old, new = baseline[metric], candidate[metric]
+        change = (new - old) / old if old else 0.0
+        worse = -change if metric.endswith(HIGHER_IS_BETTER) else change
+        flag = ""
+        if worse > args.threshold:
+            flag = " ⚠️"
+            regressions += 1
+        print(f"{metric:<48} {old:>12.3f} {new:>12.3f} {change:>+7.1%}{flag}")
+    
+    print(f"{regressions} regression(s) over {args.threshold:.0%}")
+    sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Fixed queries and deterministic synthetic corpora shared by the benchmarks."""
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from load_data import resume_blocks
+
+# Fixed job-role queries so results are comparable between runs
+JOB_ROLES = [
+    "Senior Python Developer with ML experience",
+    "Frontend Engineer with React and TypeScript",
+    "DevOps Engineer with AWS, Docker and Kubernetes",
+    "Data Scientist with NLP and PyTorch experience",
+    "Backend Java Developer with Spring Boot and microservices",
+    "Engineering Manager for a fintech payments team",
+    "Full-stack Developer for an e-commerce platform",
+    "Machine Learning Engineer with computer vision research background",
+]
+
+CONTEXT = (
+    "Skilled in Python, Flask, and REST APIs. Developed scalable backend services. "
+    "Built ML models for regression, classification, and clustering tasks. "
+    "Experience with Docker containerization and Kubernetes orchestration. "
+    "Bachelor's degree in Computer Science or related field."
+)
+
+def synthetic_blocks(count, seed=0):
+    """Unique blocks built by recombining the built-in resume blocks"""
+    rng = random.Random(seed)
+    for i in range(count):
+        first, second = rng.sample(resume_blocks, 2)
+        yield f"{first} {second} (variant {i})"
@@ -0,0 +1,83 @@
+"""Load-test the HTTP service and report QPS and latency percentiles.
+
+Start the service first: uvicorn service:app --port 8000
+Usage: python benchmarks/loadtest_service.py --endpoint /retrieve --concurrency 16 --duration 30
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import JOB_ROLES
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--endpoint", default="/retrieve", help="/retrieve, /generate/<section> or /resume")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--timeout", type=float, default=300)
+    args = parser.parse_args()
+
+    latencies = []
+    statuses = {}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.duration
+
+    def worker(index):
+        i = index
+        while time.perf_counter() < deadline:
+            job_role = JOB_ROLES[i % len(JOB_ROLES)]
+            i += 1
+            body = {"query": job_role} if args.endpoint == "/retrieve" else {"job_role": job_role}
+            request = urllib.request.Request(
+                args.url + args.endpoint,
+                data=json.dumps(body).encode("utf-8"),
+                headers={"Content-Type": "application/json"}
+            )
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request, timeout=args.timeout) as response:
+                    response.read()
+                    status = response.status
+            except urllib.error.HTTPError as exc:
+                status = exc.code
+                if status == 429:
+                    # Back off like a well-behaved client
+                    time.sleep(float(exc.headers.get("Retry-After", "1")))
+            except Exception:
+                status = "error"
+            elapsed = time.perf_counter() - start
+            with lock:
+                statuses[status] = statuses.get(status, 0) + 1
+                if status == 200:
+                    latencies.append(elapsed)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    print(f"Endpoint: {args.endpoint} | concurrency: {args.concurrency} | {wall:.1f}s")
+    print(f"QPS (200 OK): {len(latencies) / wall:.2f}")
+    print(f"Status codes: {statuses}")
+    for label, fraction in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99)):
+        print(f"{label}: {percentile(latencies, fraction) * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
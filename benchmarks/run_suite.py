@@ -0,0 +1,148 @@
+"""Reproducible benchmark suite for the RAG resume pipeline.
+
+Measures ingestion throughput, retrieval latency (Chroma and NumPy backends),
+generation latency per section and export time, and writes JSON results that
+benchmarks/compare.py can diff between runs.
+
+Fully offline by default (hashing embedder and echo generator stand-ins):
+    python benchmarks/run_suite.py --output results.json
+With small local models instead:
+    HF_HUB_OFFLINE=1 python benchmarks/run_suite.py --embedder ./models/minilm --generator ./models/flan-t5-small
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+from corpus import CONTEXT, JOB_ROLES, synthetic_blocks
+from export import export_resume
+from generation import SECTION_TYPES, generate_section
+from load_data import ingest, single_process_encoder
+from retrieval import ChromaRetriever, NumpyRetriever, write_numpy_index
+from standins import EchoGenerator, HashingEmbedder
+
+def percentile_ms(timings, q):
+    return float(np.percentile(np.asarray(timings) * 1000, q))
+
+def load_embedder(name):
+    if name == "hashing":
+        return HashingEmbedder()
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(name, device="cpu")
+
+def load_bench_generator(name):
+    if name == "echo":
+        return EchoGenerator()
+    from backends import load_generator
+    return load_generator(name)
+
+def bench_ingestion_and_retrieval(embedder, sizes, n_results, workdir):
+    """Ingest each synthetic corpus, then time single-query retrieval on both backends"""
+    import chromadb
+    
+    query_vectors = np.asarray(embedder.encode(JOB_ROLES), dtype=np.float32)
+    ingestion, retrieval = {}, {}
+    for size in sizes:
+        db_path = os.path.join(workdir, f"chroma_{size}")
+        collection = chromadb.PersistentClient(path=db_path).get_or_create_collection(name="resume_blocks")
+        stats = ingest(collection, single_process_encoder(embedder), synthetic_blocks(size), batch_size=2048)
+        ingestion[str(size)] = {
+            "blocks_per_sec": stats["seen"] / stats["seconds"],
+            "seconds": stats["seconds"],
+        }
+        
+        index_dir = os.path.join(workdir, f"numpy_{size}")
+        write_numpy_index(collection, index_dir)
+        backends = {"chroma": ChromaRetriever(collection), "numpy": NumpyRetriever(index_dir)}
+        retrieval[str(size)] = {}
+        for name, retriever in backends.items():
+            retriever.query(query_embeddings=[query_vectors[0]], n_results=n_results)
+            timings = []
+            for _ in range(10):
+                for vector in query_vectors:
+                    start = time.perf_counter()
+                    retriever.query(query_embeddings=[vector], n_results=n_results)
+                    timings.append(time.perf_counter() - start)
+            retrieval[str(size)][name] = {"p50_ms": percentile_ms(timings, 50), "p99_ms": percentile_ms(timings, 99)}
+    return ingestion, retrieval
+
+def bench_generation(generator, runs):
+    """Time each resume section over the fixed job roles"""
+    results = {}
+    for section_type in SECTION_TYPES:
+        timings = []
+        for job_role in JOB_ROLES[:runs]:
+            start = time.perf_counter()
+            generate_section(job_role, CONTEXT, section_type, generator)
+            timings.append(time.perf_counter() - start)
+        results[section_type] = {"mean_ms": statistics.mean(timings) * 1000, "p50_ms": percentile_ms(timings, 50)}
+    return results
+
+def bench_export(count):
+    """Time PDF and DOCX rendering of distinct resumes (no memoized hits)"""
+    results = {}
+    for fmt in ("pdf", "docx"):
+        start = time.perf_counter()
+        for i in range(count):
+            resume = {section_type: f"{CONTEXT} Resume {i} {section_type}." for section_type in SECTION_TYPES}
+            export_resume(resume, fmt)
+        results[fmt] = {"ms_per_resume": (time.perf_counter() - start) / count * 1000}
+    return results
+
+def run_metadata(args):
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "embedder": args.embedder,
+        "generator": args.generator,
+        "sizes": args.sizes,
+        "n_results": args.n_results,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--embedder", default="hashing", help="'hashing' stand-in or a local SentenceTransformer path")
+    parser.add_argument("--generator", default="echo", help="'echo' stand-in or a local text2text model path")
+    parser.add_argument("--n-results", type=int, default=8)
+    parser.add_argument("--generation-runs", type=int, default=len(JOB_ROLES))
+    parser.add_argument("--export-count", type=int, default=100)
+    parser.add_argument("--skip", nargs="*", default=[], choices=["ingestion", "generation", "export"])
+    parser.add_argument("--output", default="benchmark_results.json")
+    args = parser.parse_args()
+    
+    results = {"meta": run_metadata(args)}
+    if "ingestion" not in args.skip:
+        with tempfile.TemporaryDirectory() as workdir:
+            results["ingestion"], results["retrieval"] = bench_ingestion_and_retrieval(
+                load_embedder(args.embedder), args.sizes, args.n_results, workdir
+            )
+    if "generation" not in args.skip:
+        results["generation"] = bench_generation(load_bench_generator(args.generator), args.generation_runs)
+    if "export" not in args.skip:
+        results["export"] = bench_export(args.export_count)
+    
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(json.dumps({k: v for k, v in results.items() if k != "meta"}, indent=2))
+    print(f"✅ Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Small deterministic stand-ins for the embedding and generation models.
+
+They let the benchmark suite run fully offline, with no model downloads, while
+still exercising the real ingestion, retrieval, generation and export code.
+"""
+import hashlib
+import re
+
+import numpy as np
+
+class HashingEmbedder:
+    """SentenceTransformer-compatible encoder based on hashed word features"""
+
+    def __init__(self, dim=384):
+        self.dim = dim
+
+    def _encode_one(self, text):
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for token in re.findall(r"\w+", text.lower()):
+            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+            index = int.from_bytes(digest[:4], "little") % self.dim
+            sign = 1.0 if digest[4] & 1 else -1.0
+            vector[index] += sign
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def encode(self, sentences, batch_size=32, convert_to_numpy=True, **kwargs):
+        if isinstance(sentences, str):
+            return self._encode_one(sentences)
+        return np.stack([self._encode_one(text) for text in sentences]) if sentences else np.zeros((0, self.dim), np.float32)
+
+class EchoGenerator:
+    """text2text-generation pipeline stand-in that echoes the context sentences"""
+
+    def __init__(self, sentences=4):
+        self.sentences = sentences
+
+    def _generate(self, prompt):
+        context = prompt.split("Context:", 1)[-1]
+        sentences = [s.strip() for s in context.split(". ") if s.strip()]
+        return ". ".join(sentences[:self.sentences])
+
+    def __call__(self, prompts, **kwargs):
+        if isinstance(prompts, str):
+            return [{"generated_text": self._generate(prompts)}]
+        return [[{"generated_text": self._generate(prompt)}] for prompt in prompts]
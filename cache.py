@@ -0,0 +1,131 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+def generation_cache_key(prompt, model_name, generation_kwargs):
+    """Hash the exact prompt, model and decoding parameters into a cache key"""
+    payload = json.dumps(
+        {"prompt": prompt, "model": model_name, "params": generation_kwargs},
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class GenerationCache:
+    """Size-bounded SQLite cache of generated text with LRU and TTL eviction"""
+
+    def __init__(self, path, max_entries=10000, ttl_seconds=None):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS generations (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created REAL NOT NULL,
+                accessed REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS generations_accessed ON generations (accessed)")
+        self._conn.commit()
+
+    def get(self, key):
+        """Return the cached text for key, or None on a miss or expired entry"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, created FROM generations WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.ttl_seconds is not None and now - row[1] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM generations WHERE key = ?", (key,))
+                self._conn.commit()
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE generations SET accessed = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key, value):
+        """Store generated text and evict least recently used entries over the size bound"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO generations (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM generations").fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM generations WHERE key IN "
+                    "(SELECT key FROM generations ORDER BY accessed ASC LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+            self._conn.commit()
+
+    def stats(self):
+        """Return hit/miss counters and the current number of entries"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM generations").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM generations")
+            self._conn.commit()
+
+class CachedGenerator:
+    """Pipeline-compatible wrapper that serves repeated prompts from a GenerationCache
+
+    Only cache misses are sent to the wrapped generator, still as one batch.
+    """
+
+    def __init__(self, generator, cache, model_name):
+        self.generator = generator
+        self.cache = cache
+        self.model_name = model_name
+
+    def key(self, prompt, generation_kwargs, section_type=None):
+        """Cache key for one prompt; also used by stream_section so streamed and batched results are shared"""
+        # batch_size only affects throughput, not the generated text
+        key_kwargs = {k: v for k, v in generation_kwargs.items() if k not in ("batch_size", "section_type")}
+        if section_type:
+            key_kwargs["section_type"] = section_type
+        return generation_cache_key(prompt, self.model_name, key_kwargs)
+
+    def __call__(self, prompts, **generation_kwargs):
+        single = isinstance(prompts, str)
+        prompts = [prompts] if single else list(prompts)
+        # A decoding controller may get one section type per prompt; each key uses its own
+        section_types = generation_kwargs.get("section_type")
+        if not isinstance(section_types, (list, tuple)):
+            section_types = [section_types] * len(prompts)
+        keys = [self.key(prompt, generation_kwargs, section_type) for prompt, section_type in zip(prompts, section_types)]
+        texts = [self.cache.get(key) for key in keys]
+        
+        missing = [i for i, text in enumerate(texts) if text is None]
+        if missing:
+            missing_kwargs = dict(generation_kwargs)
+            if "section_type" in missing_kwargs:
+                missing_kwargs["section_type"] = [section_types[i] for i in missing]
+            outputs = self.generator([prompts[i] for i in missing], **missing_kwargs)
+            for i, output in zip(missing, outputs):
+                candidate = output[0] if isinstance(output, list) else output
+                texts[i] = candidate["generated_text"]
+                self.cache.put(keys[i], texts[i])
+        
+        if single:
+            return [{"generated_text": texts[0]}]
+        return [[{"generated_text": text}] for text in texts]
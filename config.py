@@ -0,0 +1,100 @@
+import os
+
+# Generation settings (override with environment variables)
+GENERATOR_MODEL = os.environ.get("RAG_GENERATOR_MODEL", "google/flan-t5-large")
+EMBEDDER_MODEL = os.environ.get("RAG_EMBEDDER_MODEL", "all-MiniLM-L6-v2")
+GENERATION_BATCH_SIZE = int(os.environ.get("RAG_GENERATION_BATCH_SIZE", "5"))
+BATCHED_GENERATION = os.environ.get("RAG_BATCHED_GENERATION", "1") == "1"
+
+# Cross-session micro-batching of generator calls
+USE_GENERATION_SCHEDULER = os.environ.get("RAG_GENERATION_SCHEDULER", "0") == "1"
+SCHEDULER_MAX_BATCH_SIZE = int(os.environ.get("RAG_SCHEDULER_MAX_BATCH_SIZE", "8"))
+SCHEDULER_MAX_WAIT_MS = float(os.environ.get("RAG_SCHEDULER_MAX_WAIT_MS", "20"))
+
+# Stream section text into the page as tokens are decoded
+STREAMING_GENERATION = os.environ.get("RAG_STREAMING_GENERATION", "0") == "1"
+
+# Persistent generation cache (opt-in) and deterministic decoding
+GENERATION_CACHE_PATH = os.environ.get("RAG_GENERATION_CACHE_PATH", "")
+GENERATION_CACHE_MAX_ENTRIES = int(os.environ.get("RAG_GENERATION_CACHE_MAX_ENTRIES", "10000"))
+GENERATION_CACHE_TTL_SECONDS = float(os.environ.get("RAG_GENERATION_CACHE_TTL_SECONDS", "0")) or None
+DETERMINISTIC_GENERATION = os.environ.get("RAG_DETERMINISTIC_GENERATION", "0") == "1"
+
+# Query embedding cache for retrieval
+QUERY_CACHE_SIZE = int(os.environ.get("RAG_QUERY_CACHE_SIZE", "1024"))
+QUERY_ENCODE_BATCH_SIZE = int(os.environ.get("RAG_QUERY_ENCODE_BATCH_SIZE", "64"))
+
+# Retrieval backend: "chroma" or "numpy" (exact search over an index built by load_data.py --numpy-index)
+RETRIEVER_BACKEND = os.environ.get("RAG_RETRIEVER_BACKEND", "chroma")
+NUMPY_INDEX_PATH = os.environ.get("RAG_NUMPY_INDEX_PATH", "./data/numpy_index")
+
+# Load models on a background thread as soon as the page is served
+WARMUP_MODELS = os.environ.get("RAG_WARMUP_MODELS", "0") == "1"
+
+# Generator inference backend: "pytorch" (fp32), "int8" (dynamic quantization) or "onnx"
+GENERATOR_BACKEND = os.environ.get("RAG_GENERATOR_BACKEND", "pytorch")
+ONNX_MODEL_PATH = os.environ.get("RAG_ONNX_MODEL_PATH", "")
+
+# HTTP service concurrency limits
+SERVICE_INFERENCE_WORKERS = int(os.environ.get("RAG_SERVICE_INFERENCE_WORKERS", "2"))
+SERVICE_MAX_PENDING = int(os.environ.get("RAG_SERVICE_MAX_PENDING", "16"))
+SERVICE_TIMEOUT_SECONDS = float(os.environ.get("RAG_SERVICE_TIMEOUT_SECONDS", "120"))
+
+# Render PDF/DOCX on a background pool right after generation instead of waiting for a click
+EXPORT_PRERENDER = os.environ.get("RAG_EXPORT_PRERENDER", "0") == "1"
+
+# Concurrent section generation: mode "thread" (shared weights) or "process" (one replica per worker)
+PARALLEL_SECTIONS = os.environ.get("RAG_PARALLEL_SECTIONS", "0") == "1"
+SECTION_EXECUTION_MODE = os.environ.get("RAG_SECTION_EXECUTION_MODE", "thread")
+SECTION_WORKERS = int(os.environ.get("RAG_SECTION_WORKERS", "5"))
+SECTION_TORCH_THREADS = int(os.environ.get("RAG_SECTION_TORCH_THREADS", "0")) or None
+SECTION_TIMEOUT_SECONDS = float(os.environ.get("RAG_SECTION_TIMEOUT_SECONDS", "0")) or None
+
+# Pipeline instrumentation: Streamlit debug panel and Prometheus textfile output
+DEBUG_METRICS = os.environ.get("RAG_DEBUG_METRICS", "0") == "1"
+METRICS_FILE = os.environ.get("RAG_METRICS_FILE", "")
+
+# Token-budgeted context assembly (budgets are T5 tokens of retrieved text per section prompt)
+CONTEXT_BUDGETING = os.environ.get("RAG_CONTEXT_BUDGETING", "0") == "1"
+CONTEXT_DEDUP_THRESHOLD = float(os.environ.get("RAG_CONTEXT_DEDUP_THRESHOLD", "0.9"))
+CONTEXT_MMR_LAMBDA = float(os.environ["RAG_CONTEXT_MMR_LAMBDA"]) if os.environ.get("RAG_CONTEXT_MMR_LAMBDA") else None
+SECTION_TOKEN_BUDGETS = {
+    "summary": int(os.environ.get("RAG_SUMMARY_TOKEN_BUDGET", "192")),
+    "experience": int(os.environ.get("RAG_EXPERIENCE_TOKEN_BUDGET", "256")),
+    "skills": int(os.environ.get("RAG_SKILLS_TOKEN_BUDGET", "160")),
+    "projects": int(os.environ.get("RAG_PROJECTS_TOKEN_BUDGET", "256")),
+    "education": int(os.environ.get("RAG_EDUCATION_TOKEN_BUDGET", "96")),
+}
+
+# Section-aware retrieval: one category-filtered query per section (needs blocks ingested with metadata)
+SECTION_RETRIEVAL = os.environ.get("RAG_SECTION_RETRIEVAL", "0") == "1"
+SECTION_N_RESULTS = int(os.environ.get("RAG_SECTION_N_RESULTS", "4"))
+
+# Reuse sections whose prompt inputs are unchanged since the previous run in the same session
+INCREMENTAL_GENERATION = os.environ.get("RAG_INCREMENTAL_GENERATION", "1") == "1"
+
+# Model residency: shared raw weights per process, an optional memory budget (MiB, 0 = unbounded)
+# with LRU unloading of extra generator models, and preloading before workers fork
+EXTRA_GENERATOR_MODELS = [name.strip() for name in os.environ.get("RAG_EXTRA_GENERATOR_MODELS", "").split(",") if name.strip()]
+GENERATOR_MODELS = [GENERATOR_MODEL] + [name for name in EXTRA_GENERATOR_MODELS if name != GENERATOR_MODEL]
+MODEL_MEMORY_BUDGET_MB = int(os.environ.get("RAG_MODEL_MEMORY_BUDGET_MB", "0"))
+PRELOAD_MODELS = os.environ.get("RAG_PRELOAD_MODELS", "0") == "1"
+
+# Per-section decoding control: new-token caps, stopping after N sentences/bullets (0 = no limit) or on a
+# repeated sentence, and optional assisted decoding with a small draft model (pytorch backend only)
+DECODING_CONTROL = os.environ.get("RAG_DECODING_CONTROL", "0") == "1"
+SECTION_MAX_NEW_TOKENS = {
+    "summary": int(os.environ.get("RAG_SUMMARY_MAX_NEW_TOKENS", "120")),
+    "experience": int(os.environ.get("RAG_EXPERIENCE_MAX_NEW_TOKENS", "200")),
+    "skills": int(os.environ.get("RAG_SKILLS_MAX_NEW_TOKENS", "120")),
+    "projects": int(os.environ.get("RAG_PROJECTS_MAX_NEW_TOKENS", "200")),
+    "education": int(os.environ.get("RAG_EDUCATION_MAX_NEW_TOKENS", "96")),
+}
+SECTION_MAX_UNITS = {
+    "summary": int(os.environ.get("RAG_SUMMARY_MAX_SENTENCES", "4")),
+    "experience": int(os.environ.get("RAG_EXPERIENCE_MAX_BULLETS", "5")),
+    "skills": int(os.environ.get("RAG_SKILLS_MAX_SENTENCES", "0")),
+    "projects": int(os.environ.get("RAG_PROJECTS_MAX_SENTENCES", "6")),
+    "education": int(os.environ.get("RAG_EDUCATION_MAX_SENTENCES", "4")),
+}
+DRAFT_MODEL = os.environ.get("RAG_DRAFT_MODEL", "")
@@ -0,0 +1,103 @@
+import numpy as np
+
+from metrics import registry, timed
+
+def _normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=-1, keepdims=True), 1e-12)
+
+def count_tokens(texts, tokenizer=None):
+    """Token count per text with the generator's tokenizer (whitespace words as a fallback)"""
+    if tokenizer is None:
+        return [len(text.split()) for text in texts]
+    return [len(ids) for ids in tokenizer(texts, add_special_tokens=False)["input_ids"]]
+
+def drop_near_duplicates(order, similarity, threshold):
+    """Keep blocks in order, skipping any too similar to one already kept"""
+    kept = []
+    for i in order:
+        if all(similarity[i, j] < threshold for j in kept):
+            kept.append(i)
+    return kept
+
+def mmr_order(candidates, query_similarity, similarity, mmr_lambda):
+    """Maximal marginal relevance: trade relevance to the query against redundancy"""
+    selected = []
+    remaining = list(candidates)
+    while remaining:
+        def score(i):
+            redundancy = max((similarity[i, j] for j in selected), default=0.0)
+            return mmr_lambda * query_similarity[i] - (1 - mmr_lambda) * redundancy
+        best = max(remaining, key=score)
+        selected.append(best)
+        remaining.remove(best)
+    return selected
+
+def rank_blocks(documents, embeddings, query_embedding, tokenizer=None, dedup_threshold=0.9, mmr_lambda=None):
+    """Order retrieved blocks for packing and count their tokens
+
+    Blocks keep retrieval order (or MMR order if mmr_lambda is set) and
+    near-duplicates by embedding similarity are dropped. Returns the candidate
+    indices in packing order and the token count of every block.
+    """
+    vectors = _normalize(embeddings)
+    similarity = vectors @ vectors.T
+    query_similarity = vectors @ _normalize(query_embedding).reshape(-1)
+    
+    candidates = drop_near_duplicates(range(len(documents)), similarity, dedup_threshold)
+    if mmr_lambda is not None:
+        candidates = mmr_order(candidates, query_similarity, similarity, mmr_lambda)
+    return candidates, count_tokens(documents, tokenizer)
+
+def pack_blocks(documents, candidates, token_counts, token_budget):
+    """Add ranked blocks greedily while they fit the budget, returning the context and statistics"""
+    chosen, used = [], 0
+    for i in candidates:
+        # Skip blocks that do not fit; a shorter later block still might
+        if used + token_counts[i] <= token_budget:
+            chosen.append(i)
+            used += token_counts[i]
+    
+    stats = {
+        "blocks_before": len(documents),
+        "blocks_after": len(chosen),
+        "tokens_before": sum(token_counts),
+        "tokens_after": used,
+    }
+    registry.increment("context_tokens_before_total", stats["tokens_before"])
+    registry.increment("context_tokens_after_total", stats["tokens_after"])
+    return " ".join(documents[i] for i in chosen), stats
+
+EMPTY_STATS = {"blocks_before": 0, "blocks_after": 0, "tokens_before": 0, "tokens_after": 0}
+
+@timed("build_context")
+def build_context(documents, embeddings, query_embedding, token_budget, tokenizer=None,
+                  dedup_threshold=0.9, mmr_lambda=None):
+    """Pack the most useful retrieved blocks into a token budget
+
+    Blocks are ranked by rank_blocks and added greedily while they fit.
+    Returns the context string and before/after statistics.
+    """
+    if not documents:
+        return "", dict(EMPTY_STATS)
+    candidates, token_counts = rank_blocks(documents, embeddings, query_embedding, tokenizer, dedup_threshold, mmr_lambda)
+    return pack_blocks(documents, candidates, token_counts, token_budget)
+
+@timed("build_section_contexts")
+def build_section_contexts(documents, embeddings, query_embedding, section_budgets, tokenizer=None,
+                           dedup_threshold=0.9, mmr_lambda=None):
+    """Build one budgeted context per section, returning ({section: context}, {section: stats})
+
+    Similarity, de-duplication, MMR and tokenization do not depend on the
+    budget, so they run once; only the greedy packing runs per section.
+    """
+    if not documents:
+        return (
+            {section_type: "" for section_type in section_budgets},
+            {section_type: dict(EMPTY_STATS) for section_type in section_budgets},
+        )
+    candidates, token_counts = rank_blocks(documents, embeddings, query_embedding, tokenizer, dedup_threshold, mmr_lambda)
+    contexts, stats = {}, {}
+    for section_type, budget in section_budgets.items():
+        contexts[section_type], stats[section_type] = pack_blocks(documents, candidates, token_counts, budget)
+    return contexts, stats
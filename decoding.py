@@ -0,0 +1,132 @@
+import json
+import re
+
+from metrics import registry
+
+# Sentence ends, newlines and inline bullet markers separate the units a section is counted in
+UNIT_BOUNDARY = re.compile(r"(?<=[.!?])\s+|\n+|\s+(?=[-•*]\s)")
+
+# Fragments shorter than this ("e.g.", "3.") are not counted as sentences
+MIN_UNIT_WORDS = 3
+
+def split_units(text):
+    """Split decoded text into completed sentences or bullets, leaving out a trailing fragment"""
+    parts = [part.strip(" -•*") for part in UNIT_BOUNDARY.split(text)]
+    parts = [part for part in parts if part]
+    if parts and not text.rstrip().endswith((".", "!", "?")):
+        parts = parts[:-1]
+    return [part for part in parts if len(part.split()) >= MIN_UNIT_WORDS]
+
+def normalize_unit(unit):
+    return " ".join(re.sub(r"[^a-z0-9 ]", " ", unit.lower()).split())
+
+def find_controller(generator):
+    """Return the DecodingController in a chain of generator wrappers, or None"""
+    while generator is not None:
+        if isinstance(generator, DecodingController):
+            return generator
+        generator = getattr(generator, "generator", None)
+    return None
+
+class SectionStoppingCriteria:
+    """Per-row early stopping with the transformers StoppingCriteria call signature
+
+    Each row of the decoding batch has its own token cap and unit limit, so one
+    padded batch can mix section types: finished rows stop while the rest keep
+    decoding. A row also stops as soon as its latest sentence repeats an
+    earlier one, instead of paying for the repetition and removing it later.
+    """
+
+    def __init__(self, tokenizer, max_new_tokens, max_units, stop_on_duplicate=True, start_length=1):
+        self.tokenizer = tokenizer
+        self.max_new_tokens = list(max_new_tokens)
+        self.max_units = list(max_units)
+        self.stop_on_duplicate = stop_on_duplicate
+        # Encoder-decoder outputs start with one decoder start token
+        self.start_length = start_length
+        self.reasons = [None] * len(self.max_new_tokens)
+
+    def _check(self, row, generated):
+        if len(generated) >= self.max_new_tokens[row]:
+            return "token_cap"
+        units = split_units(self.tokenizer.decode(generated, skip_special_tokens=True))
+        if self.max_units[row] and len(units) >= self.max_units[row]:
+            return "unit_limit"
+        if self.stop_on_duplicate and len(units) > 1:
+            if normalize_unit(units[-1]) in {normalize_unit(unit) for unit in units[:-1]}:
+                return "duplicate"
+        return None
+
+    def __call__(self, input_ids, scores, **kwargs):
+        import torch
+
+        for row, ids in enumerate(input_ids):
+            if self.reasons[row] is None:
+                self.reasons[row] = self._check(row, ids[self.start_length:])
+        return torch.tensor([reason is not None for reason in self.reasons], dtype=torch.bool, device=input_ids.device)
+
+class DecodingController:
+    """Pipeline wrapper that decodes each prompt with its section's token cap and stopping rules
+
+    Callers pass section_type (one name, or one per prompt) next to the usual
+    generation kwargs; prompts without one decode unchanged. Mixed sections in
+    one call are decoded as a single batch so each row keeps its own limits.
+    With an assistant model, single prompts use assisted decoding: the small
+    draft model proposes tokens and the large model verifies them in one
+    forward pass. Under greedy decoding the output matches the large model's.
+    """
+
+    def __init__(self, generator, max_new_tokens, max_units, stop_on_duplicate=True, assistant_model=None):
+        self.generator = generator
+        self.max_new_tokens = dict(max_new_tokens)
+        self.max_units = dict(max_units)
+        self.stop_on_duplicate = stop_on_duplicate
+        self.assistant_model = assistant_model
+
+    def signature(self):
+        """Decoding limits as a string, for cache keys that must change when the limits do"""
+        return json.dumps(
+            {"max_new_tokens": self.max_new_tokens, "max_units": self.max_units, "dedup": self.stop_on_duplicate},
+            sort_keys=True
+        )
+
+    def generation_kwargs(self, section_types, generation_kwargs):
+        """Translate per-prompt section types into model.generate kwargs and the stopping criteria used"""
+        from transformers import StoppingCriteriaList
+
+        kwargs = dict(generation_kwargs)
+        default_cap = kwargs.pop("max_length", 400)
+        caps = [self.max_new_tokens.get(section_type, default_cap) for section_type in section_types]
+        criteria = SectionStoppingCriteria(
+            self.generator.tokenizer,
+            max_new_tokens=caps,
+            max_units=[self.max_units.get(section_type, 0) for section_type in section_types],
+            stop_on_duplicate=self.stop_on_duplicate
+        )
+        kwargs["max_new_tokens"] = max(caps)
+        kwargs["stopping_criteria"] = StoppingCriteriaList([criteria])
+        if self.assistant_model is not None and len(section_types) == 1:
+            # Assisted decoding only supports one sequence at a time
+            kwargs["assistant_model"] = self.assistant_model
+        return kwargs, criteria
+
+    def record(self, criteria):
+        """Count why rows stopped early"""
+        for reason in criteria.reasons:
+            if reason is not None:
+                registry.increment(f"decoding_stop_{reason}_total")
+
+    def __call__(self, prompts, **generation_kwargs):
+        section_type = generation_kwargs.pop("section_type", None)
+        count = 1 if isinstance(prompts, str) else len(prompts)
+        section_types = list(section_type) if isinstance(section_type, (list, tuple)) else [section_type] * count
+        if all(section_type is None for section_type in section_types):
+            return self.generator(prompts, **generation_kwargs)
+
+        kwargs, criteria = self.generation_kwargs(section_types, generation_kwargs)
+        if count > 1:
+            # Stopping criteria rows line up with the prompts only if they share one generate call
+            kwargs["batch_size"] = count
+        outputs = self.generator(prompts, **kwargs)
+        self.record(criteria)
+        return outputs
@@ -0,0 +1,113 @@
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from generation import SECTION_TYPES, generate_section
+
+# Generator replica owned by each worker process
+_worker_generator = None
+
+def _set_torch_threads(torch_threads):
+    if torch_threads:
+        import torch
+        torch.set_num_threads(torch_threads)
+
+def _init_process_worker(model_name, backend, onnx_path, torch_threads):
+    """Load one generator replica per worker process"""
+    global _worker_generator
+    from backends import load_generator
+    from generation import MeteredGenerator
+    from models import with_decoding_control
+    
+    _set_torch_threads(torch_threads)
+    _worker_generator = with_decoding_control(MeteredGenerator(load_generator(model_name, backend, onnx_path)))
+
+def _generate_in_process(job_role, context, section_type, experience_level, industry):
+    return generate_section(job_role, context, section_type, _worker_generator, experience_level, industry)
+
+class SectionExecutor:
+    """Generate resume sections concurrently, each with its own deadline
+
+    thread mode shares the already-loaded generator weights between threads;
+    process mode gives every worker process its own model replica. In both
+    modes torch_threads caps the intra-op threads per model call, so
+    workers x torch_threads can be tuned to the machine's core count.
+
+    A timeout only abandons a section: a model call that has already started
+    cannot be interrupted, so it keeps its worker and CPU until it finishes,
+    and later sections queue behind it. Such calls are tracked as stale;
+    check stale_count() before submitting new work.
+    """
+
+    def __init__(self, generator=None, mode="thread", workers=5, torch_threads=None,
+                 model_name=None, backend="pytorch", onnx_path=""):
+        self.mode = mode
+        self.workers = workers
+        self.generator = generator
+        self._stale = set()
+        self._stale_lock = threading.Lock()
+        if mode == "thread":
+            if generator is None:
+                raise ValueError("thread mode needs a loaded generator to share")
+            # Intra-op threads are process-wide, so this caps every concurrent call
+            _set_torch_threads(torch_threads)
+            self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="section")
+        elif mode == "process":
+            if model_name is None:
+                raise ValueError("process mode needs a model name to load in each worker")
+            # Spawn rather than fork so workers do not inherit torch's thread pools
+            self.pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_process_worker,
+                initargs=(model_name, backend, onnx_path, torch_threads)
+            )
+        else:
+            raise ValueError(f"Unknown section execution mode '{mode}', expected 'thread' or 'process'")
+
+    def _submit(self, job_role, context, section_type, experience_level, industry):
+        if self.mode == "thread":
+            return self.pool.submit(
+                generate_section, job_role, context, section_type, self.generator, experience_level, industry
+            )
+        return self.pool.submit(_generate_in_process, job_role, context, section_type, experience_level, industry)
+
+    def generate(self, job_role, context, section_types=None, timeout=None, experience_level=None, industry=None):
+        """Return (sections, timed_out) where timed-out sections come back empty"""
+        section_types = section_types or SECTION_TYPES
+        futures = {
+            section_type: self._submit(job_role, context, section_type, experience_level, industry)
+            for section_type in section_types
+        }
+        deadline = time.perf_counter() + timeout if timeout else None
+        
+        sections = {}
+        timed_out = []
+        for section_type, future in futures.items():
+            remaining = max(0.0, deadline - time.perf_counter()) if deadline else None
+            try:
+                sections[section_type] = future.result(timeout=remaining)
+            except FutureTimeoutError:
+                # Degrade to an empty section instead of failing the whole resume
+                if not future.cancel():
+                    # Already running: it still holds a worker until the model call returns
+                    with self._stale_lock:
+                        self._stale.add(future)
+                    future.add_done_callback(self._forget_stale)
+                sections[section_type] = ""
+                timed_out.append(section_type)
+        return sections, timed_out
+
+    def _forget_stale(self, future):
+        with self._stale_lock:
+            self._stale.discard(future)
+
+    def stale_count(self):
+        """Timed-out sections whose model calls are still occupying workers"""
+        with self._stale_lock:
+            return len(self._stale)
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False)
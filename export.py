@@ -0,0 +1,209 @@
+import hashlib
+import io
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+
+from metrics import timed
+
+# reportlab and python-docx are imported inside the builders so they only load when exporting
+
+RESUME_SECTIONS = [
+    ("Professional Summary", "summary"),
+    ("Work Experience", "experience"),
+    ("Technical Skills", "skills"),
+    ("Key Projects", "projects"),
+    ("Education", "education"),
+]
+
+EXPORT_CACHE_SIZE = 256
+
+_export_cache = OrderedDict()
+_export_cache_lock = threading.Lock()
+_export_pool = None
+# Renders submitted to the pool and not finished yet, (resume hash, format) -> Future
+_export_inflight = {}
+
+@lru_cache(maxsize=None)
+def _pdf_styles():
+    """Build the PDF paragraph styles once per process"""
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib import colors
+    
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=16,
+        spaceAfter=12,
+        textColor=colors.darkblue
+    )
+    heading_style = ParagraphStyle(
+        'CustomHeading',
+        parent=styles['Heading2'],
+        fontSize=14,
+        spaceAfter=8,
+        textColor=colors.darkblue
+    )
+    return title_style, heading_style, styles['Normal']
+
+@lru_cache(maxsize=None)
+def _docx_template():
+    """Serialize a document with the title already laid out, once per process"""
+    from docx import Document
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    
+    doc = Document()
+    title = doc.add_heading('Professional Resume', 0)
+    title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+@timed("export_pdf")
+def create_pdf_resume(resume_data):
+    """Create a PDF resume"""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+    
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter)
+    story = []
+    
+    # Get styles
+    title_style, heading_style, normal_style = _pdf_styles()
+    
+    # Add title
+    story.append(Paragraph("Professional Resume", title_style))
+    story.append(Spacer(1, 12))
+    
+    # Add sections
+    for section_title, key in RESUME_SECTIONS:
+        content = resume_data.get(key, "")
+        if content:
+            story.append(Paragraph(section_title, heading_style))
+            story.append(Paragraph(content, normal_style))
+            story.append(Spacer(1, 12))
+    
+    doc.build(story)
+    buffer.seek(0)
+    return buffer
+
+@timed("export_docx")
+def create_docx_resume(resume_data):
+    """Create a DOCX resume"""
+    from docx import Document
+    
+    # Start from the pre-built template that already holds the title
+    doc = Document(io.BytesIO(_docx_template()))
+    
+    # Add sections
+    for section_title, key in RESUME_SECTIONS:
+        content = resume_data.get(key, "")
+        if content:
+            doc.add_heading(section_title, level=1)
+            doc.add_paragraph(content)
+            doc.add_paragraph()  # Add spacing
+    
+    # Save to buffer
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+def format_text_resume(resume_data):
+    """Format a plain-text/Markdown resume"""
+    return f"""
+# Professional Resume
+
+## Professional Summary
+{resume_data.get("summary", "")}
+
+## Work Experience
+{resume_data.get("experience", "")}
+
+## Technical Skills
+{resume_data.get("skills", "")}
+
+## Key Projects
+{resume_data.get("projects", "")}
+
+## Education
+{resume_data.get("education", "")}
+        """
+
+_BUILDERS = {
+    "pdf": lambda resume_data: create_pdf_resume(resume_data).getvalue(),
+    "docx": lambda resume_data: create_docx_resume(resume_data).getvalue(),
+    "txt": lambda resume_data: format_text_resume(resume_data).encode("utf-8"),
+}
+
+def resume_hash(resume_data):
+    """Stable hash of the resume content used to memoize exports"""
+    payload = json.dumps(resume_data, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def cached_export(resume_data, fmt):
+    """Return memoized export bytes, or None if this format has not been rendered yet"""
+    key = (resume_hash(resume_data), fmt)
+    with _export_cache_lock:
+        data = _export_cache.get(key)
+        if data is not None:
+            _export_cache.move_to_end(key)
+        return data
+
+def _render(resume_data, fmt, key):
+    data = _BUILDERS[fmt](resume_data)
+    with _export_cache_lock:
+        _export_cache[key] = data
+        while len(_export_cache) > EXPORT_CACHE_SIZE:
+            _export_cache.popitem(last=False)
+    return data
+
+def pending_export(resume_data, fmt):
+    """Return the Future of a render already running on the export pool, or None"""
+    with _export_cache_lock:
+        return _export_inflight.get((resume_hash(resume_data), fmt))
+
+def export_resume(resume_data, fmt):
+    """Render a resume to bytes on demand, memoized by a hash of its content"""
+    if fmt not in _BUILDERS:
+        raise ValueError(f"Unknown export format '{fmt}'")
+    data = cached_export(resume_data, fmt)
+    if data is not None:
+        return data
+    
+    # Wait for a pre-render of the same content instead of rendering it twice
+    future = pending_export(resume_data, fmt)
+    if future is not None:
+        return future.result()
+    return _render(resume_data, fmt, (resume_hash(resume_data), fmt))
+
+def submit_export(resume_data, fmt, workers=2):
+    """Render a resume on the shared export worker pool and return a Future"""
+    global _export_pool
+    if fmt not in _BUILDERS:
+        raise ValueError(f"Unknown export format '{fmt}'")
+    data = cached_export(resume_data, fmt)
+    if data is not None:
+        future = Future()
+        future.set_result(data)
+        return future
+    
+    key = (resume_hash(resume_data), fmt)
+    with _export_cache_lock:
+        if _export_pool is None:
+            _export_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="export")
+        future = _export_inflight.get(key)
+        if future is not None:
+            return future
+        future = _export_inflight[key] = _export_pool.submit(_render, dict(resume_data), fmt, key)
+    # Outside the lock: the callback runs immediately if the render has already finished
+    future.add_done_callback(lambda _future: _forget_inflight(key))
+    return future
+
+def _forget_inflight(key):
+    with _export_cache_lock:
+        _export_inflight.pop(key, None)
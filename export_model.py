@@ -0,0 +1,53 @@
+"""Export the generator to ONNX (optionally int8-quantized) for the onnx backend.
+
+Usage: python export_model.py --model google/flan-t5-large --output ./models/flan-t5-large-onnx [--quantize]
+Then run the app with RAG_GENERATOR_BACKEND=onnx RAG_ONNX_MODEL_PATH=<output>.
+"""
+import argparse
+import glob
+import os
+import shutil
+
+def export_onnx(model_name, output_dir):
+    """Export encoder and KV-cache decoders to ONNX alongside the tokenizer"""
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    from transformers import AutoTokenizer
+    
+    model = ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True, use_cache=True)
+    model.save_pretrained(output_dir)
+    AutoTokenizer.from_pretrained(model_name).save_pretrained(output_dir)
+
+def quantize_onnx(source_dir, output_dir):
+    """Dynamically quantize every exported ONNX graph to int8 weights"""
+    from optimum.onnxruntime import ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    
+    config = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+    os.makedirs(output_dir, exist_ok=True)
+    for onnx_file in sorted(glob.glob(os.path.join(source_dir, "*.onnx"))):
+        quantizer = ORTQuantizer.from_pretrained(source_dir, file_name=os.path.basename(onnx_file))
+        # An empty suffix keeps the file names the loader expects
+        quantizer.quantize(save_dir=output_dir, quantization_config=config, file_suffix="")
+    
+    # Configs and tokenizer files are shared with the fp32 export
+    for path in glob.glob(os.path.join(source_dir, "*")):
+        if not path.endswith(".onnx") and os.path.isfile(path):
+            shutil.copy(path, output_dir)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="google/flan-t5-large")
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--quantize", action="store_true", help="also write an int8 copy to <output>-int8")
+    args = parser.parse_args()
+    
+    export_onnx(args.model, args.output)
+    print(f"✅ ONNX model written to {args.output}")
+    
+    if args.quantize:
+        quantized_dir = args.output.rstrip("/") + "-int8"
+        quantize_onnx(args.output, quantized_dir)
+        print(f"✅ int8 ONNX model written to {quantized_dir}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+import time
+
+from cache import CachedGenerator
+from config import DETERMINISTIC_GENERATION
+from decoding import find_controller
+from metrics import registry, timed
+
+SECTION_TYPES = ["summary", "experience", "skills", "projects", "education"]
+
+PROMPT_TEMPLATE_VERSION = 2
+
+SAMPLING_GENERATION_KWARGS = {
+    "max_length": 400,
+    "do_sample": True,
+    "temperature": 0.8,
+    "top_p": 0.9,
+    "repetition_penalty": 1.2,
+}
+
+# Greedy decoding gives the same output for the same prompt, so cached results stay meaningful
+GREEDY_GENERATION_KWARGS = {
+    "max_length": 400,
+    "do_sample": False,
+    "repetition_penalty": 1.2,
+}
+
+GENERATION_KWARGS = GREEDY_GENERATION_KWARGS if DETERMINISTIC_GENERATION else SAMPLING_GENERATION_KWARGS
+
+def build_prompt(job_role, context, section_type="summary", experience_level=None, industry=None):
+    """Build the generation prompt for a resume section
+
+    context is either one string shared by all sections or a dict of
+    per-section contexts. Bump PROMPT_TEMPLATE_VERSION whenever the wording
+    changes so stored sections are regenerated.
+    """
+    if isinstance(context, dict):
+        context = context.get(section_type, "")
+    # Fold the selected experience level and industry into the role description
+    if experience_level:
+        job_role = f"{job_role} ({experience_level})"
+    if industry and industry != "General":
+        job_role = f"{job_role} in the {industry} industry"
+    prompts = {
+        "summary": f"""Write a concise, professional summary for a resume targeting the job role: {job_role}. 
+        Use the context below to create a compelling summary that highlights relevant skills and experience. 
+        Make it sound professional and avoid repetition. Context: {context}""",
+        
+        "experience": f"""Create 3-4 unique bullet points describing relevant work experience for a {job_role} role. 
+        Each bullet should be specific and highlight different achievements or responsibilities. 
+        Use the context below and avoid repeating phrases. Context: {context}""",
+        
+        "skills": f"""List technical skills and competencies relevant for a {job_role} position. 
+        Organize them by category (e.g., Programming Languages, Frameworks, Tools). 
+        Use the context below and avoid listing the same skill multiple times. Context: {context}""",
+        
+        "projects": f"""Describe 2-3 unique projects relevant for a {job_role} role. 
+        Each project should have a clear description of the technology used and outcomes achieved. 
+        Use the context below and avoid repetition. Context: {context}""",
+        
+        "education": f"""Write an education section appropriate for a {job_role} position. 
+        Include relevant degrees, certifications, and any specialized training. 
+        Use the context below and avoid repetition. Context: {context}"""
+    }
+    return prompts.get(section_type, prompts["summary"])
+
+@timed("remove_duplicates")
+def remove_duplicates(text):
+    """Remove duplicate sentences and clean up the text"""
+    if not text:
+        return text
+    
+    # Split by sentences and remove duplicates
+    sentences = text.split('. ')
+    seen = set()
+    unique_sentences = []
+    
+    for sentence in sentences:
+        sentence = sentence.strip()
+        if sentence and sentence not in seen:
+            unique_sentences.append(sentence)
+            seen.add(sentence)
+    
+    # Join back with proper punctuation
+    result = '. '.join(unique_sentences)
+    if result and not result.endswith('.'):
+        result += '.'
+    
+    return result
+
+def unwrap_pipeline(generator):
+    """Return the transformers pipeline underneath any scheduler or cache wrappers"""
+    pipe = generator
+    while hasattr(pipe, "generator"):
+        pipe = pipe.generator
+    return pipe
+
+def find_layer(generator, layer_type):
+    """Return the wrapper of the given type in a chain of generator wrappers, or None"""
+    while generator is not None:
+        if isinstance(generator, layer_type):
+            return generator
+        generator = getattr(generator, "generator", None)
+    return None
+
+def record_token_counts(tokenizer, prompts, responses):
+    """Count prompt and generated tokens with the generator's own tokenizer"""
+    if tokenizer is None:
+        return
+    registry.increment("prompt_tokens_total", sum(len(ids) for ids in tokenizer(prompts)["input_ids"]))
+    registry.increment("generated_tokens_total", sum(len(ids) for ids in tokenizer(responses)["input_ids"]))
+
+class MeteredGenerator:
+    """Pipeline wrapper that times model calls and counts the tokens they process
+
+    It sits directly around the pipeline, under any cache or scheduler, so
+    cache hits never reach it and generated_tokens_total / model_generate
+    time is the model's real throughput.
+    """
+
+    def __init__(self, generator):
+        self.generator = generator
+        self.tokenizer = getattr(generator, "tokenizer", None)
+
+    def __call__(self, prompts, **generation_kwargs):
+        with timed("model_generate"):
+            outputs = self.generator(prompts, **generation_kwargs)
+        # A string input yields one list of candidates, a list input one per prompt
+        rows = [outputs] if isinstance(prompts, str) else outputs
+        responses = [(row[0] if isinstance(row, list) else row)["generated_text"] for row in rows]
+        record_token_counts(self.tokenizer, [prompts] if isinstance(prompts, str) else list(prompts), responses)
+        return outputs
+
+def section_kwargs(generator, section_types):
+    """Tell a decoding controller, if the generator has one, which section each prompt is for"""
+    return {"section_type": section_types} if find_controller(generator) is not None else {}
+
+def generate_section(job_role, context, section_type, generator, experience_level=None, industry=None):
+    """Generate a single resume section with one generator call"""
+    prompt = build_prompt(job_role, context, section_type, experience_level, industry)
+    with timed("generate_section"):
+        response = generator(prompt, **GENERATION_KWARGS, **section_kwargs(generator, section_type))[0]["generated_text"]
+    return remove_duplicates(response)
+
+def generate_sections_batched(job_role, context, generator, section_types=None, batch_size=5,
+                              experience_level=None, industry=None):
+    """Generate several resume sections in one padded generator batch"""
+    section_types = section_types or SECTION_TYPES
+    prompts = [
+        build_prompt(job_role, context, section_type, experience_level, industry)
+        for section_type in section_types
+    ]
+    
+    # The pipeline pads the prompts and runs them through the model batch_size at a time
+    with timed("generate_batch"):
+        outputs = generator(
+            prompts, batch_size=batch_size, **GENERATION_KWARGS, **section_kwargs(generator, tuple(section_types))
+        )
+    
+    # A list input yields one list of candidates per prompt
+    responses = [(output[0] if isinstance(output, list) else output)["generated_text"] for output in outputs]
+    return {
+        section_type: remove_duplicates(response)
+        for section_type, response in zip(section_types, responses)
+    }
+
+def stream_section(job_role, context, section_type, generator, timings=None, experience_level=None, industry=None):
+    """Yield the text of a resume section as the model decodes it
+
+    If a timings dict is given it is filled with time_to_first_token and
+    total seconds for the section once the stream is exhausted.
+    Streaming drives the model directly, so a scheduler in the wrapper chain
+    is bypassed and the section is decoded on its own. A generation cache is
+    still used: a cached section is yielded at once, and a streamed one is
+    stored under the key a non-streamed call would use.
+    """
+    from threading import Thread
+    from transformers import TextIteratorStreamer
+    
+    prompt = build_prompt(job_role, context, section_type, experience_level, industry)
+    start = time.perf_counter()
+    
+    # Same key as generate_section, which only passes section_type to a decoding controller
+    controller = find_controller(generator)
+    cached = find_layer(generator, CachedGenerator)
+    key = text = None
+    if cached is not None:
+        key = cached.key(prompt, GENERATION_KWARGS, section_type if controller is not None else None)
+        text = cached.cache.get(key)
+    if text is not None:
+        elapsed = time.perf_counter() - start
+        registry.observe("generate_section", elapsed)
+        if timings is not None:
+            timings["time_to_first_token"] = timings["total"] = elapsed
+        yield text
+        return
+    
+    # Schedulers and caches wrap the real pipeline; streaming needs the model itself
+    pipe = unwrap_pipeline(generator)
+    tokenizer = pipe.tokenizer
+    model = pipe.model
+    
+    inputs = tokenizer(prompt, return_tensors="pt", truncation=True).to(model.device)
+    # Decode like the text2text pipeline does, so cached text matches a non-streamed call
+    streamer = TextIteratorStreamer(tokenizer, skip_special_tokens=True, clean_up_tokenization_spaces=False)
+    
+    # Apply the section's token cap and stopping rules when a decoding controller is configured
+    generation_kwargs, criteria = GENERATION_KWARGS, None
+    if controller is not None:
+        generation_kwargs, criteria = controller.generation_kwargs([section_type], GENERATION_KWARGS)
+    
+    errors = []
+    
+    def decode():
+        try:
+            model.generate(**inputs, streamer=streamer, **generation_kwargs)
+        except BaseException as exc:
+            # Without the end marker the loop below would wait for tokens forever
+            errors.append(exc)
+            streamer.end()
+    
+    first_token_at = None
+    pieces = []
+    thread = Thread(target=decode)
+    thread.start()
+    for text in streamer:
+        if first_token_at is None and text:
+            first_token_at = time.perf_counter()
+        pieces.append(text)
+        yield text
+    thread.join()
+    if errors:
+        raise errors[0]
+    if criteria is not None:
+        controller.record(criteria)
+    if cached is not None:
+        cached.cache.put(key, "".join(pieces))
+    
+    # The model is called directly here, so record what MeteredGenerator would have
+    end = time.perf_counter()
+    record_token_counts(tokenizer, [prompt], ["".join(pieces)])
+    registry.observe("model_generate", end - start)
+    registry.observe("generate_first_token", (first_token_at or end) - start)
+    registry.observe("generate_section", end - start)
+    if timings is not None:
+        timings["time_to_first_token"] = (first_token_at or end) - start
+        timings["total"] = end - start
@@ -0,0 +1,42 @@
+import hashlib
+import json
+
+from generation import PROMPT_TEMPLATE_VERSION
+
+def section_input_key(section_type, job_role, block_ids, experience_level, industry, model_name=""):
+    """Hash every input that feeds one section's prompt"""
+    payload = json.dumps(
+        {
+            "section": section_type,
+            "job_role": " ".join(job_role.split()),
+            "block_ids": list(block_ids),
+            "experience_level": experience_level,
+            "industry": industry,
+            "template_version": PROMPT_TEMPLATE_VERSION,
+            "model": model_name,
+        },
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def plan_regeneration(store, input_keys):
+    """Split sections into ones reusable from store and ones whose inputs changed
+
+    store maps section -> (input_key, text), e.g. st.session_state or a
+    server-side dict. Returns ({section: text} to reuse, [sections to regenerate]).
+    """
+    reused, stale = {}, []
+    for section_type, key in input_keys.items():
+        entry = store.get(section_type)
+        if entry is not None and entry[0] == key:
+            reused[section_type] = entry[1]
+        else:
+            stale.append(section_type)
+    return reused, stale
+
+def update_store(store, input_keys, sections):
+    """Remember freshly generated sections under their input keys"""
+    for section_type, text in sections.items():
+        # Empty text means the section failed or timed out; try again next time
+        if text:
+            store[section_type] = (input_keys[section_type], text)
@@ -1,98 +1,346 @@
-from sentence_transformers import SentenceTransformer
-import chromadb
-from chromadb.config import Settings
-
-resume_blocks = [
-    # Technical Skills - Programming
-    "Skilled in Python, Flask, and REST APIs. Developed scalable backend services.",
-    "Proficient in JavaScript, React, and Node.js for full-stack development.",
-    "Experienced in Java, Spring Boot, and microservices architecture.",
-    "Strong knowledge of C++, data structures, and algorithms.",
-    "Familiar with TypeScript, Angular, and modern frontend frameworks.",
-    
-    # Data Science & ML
-    "Experienced in data analysis using Pandas, NumPy, and Excel.",
-    "Built ML models for regression, classification, and clustering tasks.",
-    "Experience using Hugging Face Transformers and NLP techniques.",
-    "Skilled in TensorFlow and PyTorch for deep learning applications.",
-    "Proficient in data visualization with Matplotlib, Seaborn, and Plotly.",
-    "Experience with scikit-learn for machine learning pipelines.",
-    
-    # Cloud & DevOps
-    "Familiarity with cloud platforms like AWS and GCP.",
-    "Experience with Docker containerization and Kubernetes orchestration.",
-    "Proficient in CI/CD pipelines using Jenkins and GitHub Actions.",
-    "Knowledge of infrastructure as code using Terraform and CloudFormation.",
-    
-    # Database & Backend
-    "Experience with SQL databases including PostgreSQL and MySQL.",
-    "Familiar with NoSQL databases like MongoDB and Redis.",
-    "Built RESTful APIs and GraphQL services.",
-    "Experience with message queues like RabbitMQ and Apache Kafka.",
-    
-    # Frontend & UI/UX
-    "Designed responsive UIs using React and integrated with backend APIs.",
-    "Experience with CSS frameworks like Bootstrap and Tailwind CSS.",
-    "Skilled in creating accessible and user-friendly interfaces.",
-    "Proficient in modern JavaScript (ES6+) and async programming.",
-    
-    # Soft Skills
-    "Strong communication and team collaboration skills.",
-    "Experience leading cross-functional teams and mentoring junior developers.",
-    "Excellent problem-solving abilities and analytical thinking.",
-    "Proven track record of delivering projects on time and within budget.",
-    "Strong presentation skills and ability to explain technical concepts to non-technical stakeholders.",
-    
-    # Project Management
-    "Experience with Agile methodologies including Scrum and Kanban.",
-    "Proficient in project management tools like Jira and Asana.",
-    "Track record of managing multiple projects simultaneously.",
-    "Experience with stakeholder management and requirement gathering.",
-    
-    # Version Control & Tools
-    "Proficient in version control using Git and collaborative tools like GitHub.",
-    "Experience with code review processes and maintaining code quality.",
-    "Familiar with IDEs like VS Code, IntelliJ, and PyCharm.",
-    "Knowledge of testing frameworks and TDD practices.",
-    
-    # Industry Experience
-    "5+ years of experience in software development and system architecture.",
-    "Experience working in fast-paced startup environments.",
-    "Background in fintech with knowledge of payment processing systems.",
-    "Experience in e-commerce platforms and customer-facing applications.",
-    "Knowledge of cybersecurity best practices and secure coding standards.",
-    
-    # Education & Certifications
-    "Bachelor's degree in Computer Science or related field.",
-    "Certified AWS Solutions Architect with hands-on cloud experience.",
-    "Completed advanced courses in machine learning and data science.",
-    "Active participation in open-source projects and tech communities.",
-    
-    # Leadership & Innovation
-    "Led technical initiatives that improved system performance by 40%.",
-    "Mentored 5+ junior developers and conducted technical interviews.",
-    "Introduced new technologies that reduced development time by 30%.",
-    "Experience with technical architecture decisions and system design.",
-    
-    # Research & Development
-    "Published research papers in machine learning and computer vision.",
-    "Experience with cutting-edge technologies like blockchain and IoT.",
-    "Contributed to open-source projects with 1000+ GitHub stars.",
-    "Experience with research and development in emerging technologies.",
-]
-
-# Setup
-embed_model = SentenceTransformer('all-MiniLM-L6-v2')
-client = chromadb.PersistentClient(path="./data")
-collection = client.get_or_create_collection(name="resume_blocks")
-
-for i, text in enumerate(resume_blocks):
-    embedding = embed_model.encode(text).tolist()
-    collection.add(
-        documents=[text],
-        embeddings=[embedding],
-        ids=[str(i)]
-    )
-
-print("✅ Resume data added to ChromaDB!")
-print(f"📊 Total resume blocks loaded: {len(resume_blocks)}")
\ No newline at end of file
+import argparse
+import csv
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+
+from retrieval import write_numpy_index
+from skills import infer_seniority
+
+resume_block_groups = {
+    "Technical Skills - Programming": [
+        "Skilled in Python, Flask, and REST APIs. Developed scalable backend services.",
+        "Proficient in JavaScript, React, and Node.js for full-stack development.",
+        "Experienced in Java, Spring Boot, and microservices architecture.",
+        "Strong knowledge of C++, data structures, and algorithms.",
+        "Familiar with TypeScript, Angular, and modern frontend frameworks.",
+    ],
+    
+    "Data Science & ML": [
+        "Experienced in data analysis using Pandas, NumPy, and Excel.",
+        "Built ML models for regression, classification, and clustering tasks.",
+        "Experience using Hugging Face Transformers and NLP techniques.",
+        "Skilled in TensorFlow and PyTorch for deep learning applications.",
+        "Proficient in data visualization with Matplotlib, Seaborn, and Plotly.",
+        "Experience with scikit-learn for machine learning pipelines.",
+    ],
+    
+    "Cloud & DevOps": [
+        "Familiarity with cloud platforms like AWS and GCP.",
+        "Experience with Docker containerization and Kubernetes orchestration.",
+        "Proficient in CI/CD pipelines using Jenkins and GitHub Actions.",
+        "Knowledge of infrastructure as code using Terraform and CloudFormation.",
+    ],
+    
+    "Database & Backend": [
+        "Experience with SQL databases including PostgreSQL and MySQL.",
+        "Familiar with NoSQL databases like MongoDB and Redis.",
+        "Built RESTful APIs and GraphQL services.",
+        "Experience with message queues like RabbitMQ and Apache Kafka.",
+    ],
+    
+    "Frontend & UI/UX": [
+        "Designed responsive UIs using React and integrated with backend APIs.",
+        "Experience with CSS frameworks like Bootstrap and Tailwind CSS.",
+        "Skilled in creating accessible and user-friendly interfaces.",
+        "Proficient in modern JavaScript (ES6+) and async programming.",
+    ],
+    
+    "Soft Skills": [
+        "Strong communication and team collaboration skills.",
+        "Experience leading cross-functional teams and mentoring junior developers.",
+        "Excellent problem-solving abilities and analytical thinking.",
+        "Proven track record of delivering projects on time and within budget.",
+        "Strong presentation skills and ability to explain technical concepts to non-technical stakeholders.",
+    ],
+    
+    "Project Management": [
+        "Experience with Agile methodologies including Scrum and Kanban.",
+        "Proficient in project management tools like Jira and Asana.",
+        "Track record of managing multiple projects simultaneously.",
+        "Experience with stakeholder management and requirement gathering.",
+    ],
+    
+    "Version Control & Tools": [
+        "Proficient in version control using Git and collaborative tools like GitHub.",
+        "Experience with code review processes and maintaining code quality.",
+        "Familiar with IDEs like VS Code, IntelliJ, and PyCharm.",
+        "Knowledge of testing frameworks and TDD practices.",
+    ],
+    
+    "Industry Experience": [
+        "5+ years of experience in software development and system architecture.",
+        "Experience working in fast-paced startup environments.",
+        "Background in fintech with knowledge of payment processing systems.",
+        "Experience in e-commerce platforms and customer-facing applications.",
+        "Knowledge of cybersecurity best practices and secure coding standards.",
+    ],
+    
+    "Education & Certifications": [
+        "Bachelor's degree in Computer Science or related field.",
+        "Certified AWS Solutions Architect with hands-on cloud experience.",
+        "Completed advanced courses in machine learning and data science.",
+        "Active participation in open-source projects and tech communities.",
+    ],
+    
+    "Leadership & Innovation": [
+        "Led technical initiatives that improved system performance by 40%.",
+        "Mentored 5+ junior developers and conducted technical interviews.",
+        "Introduced new technologies that reduced development time by 30%.",
+        "Experience with technical architecture decisions and system design.",
+    ],
+    
+    "Research & Development": [
+        "Published research papers in machine learning and computer vision.",
+        "Experience with cutting-edge technologies like blockchain and IoT.",
+        "Contributed to open-source projects with 1000+ GitHub stars.",
+        "Experience with research and development in emerging technologies.",
+    ],
+}
+
+# Flat list of the built-in blocks, in category order
+resume_blocks = [text for blocks in resume_block_groups.values() for text in blocks]
+
+def block_id(text):
+    """Content-hash id so re-ingesting the same block is a no-op"""
+    return hashlib.sha256(text.strip().encode("utf-8")).hexdigest()[:32]
+
+def block_metadata(text, category=None):
+    """Category and seniority stored with each block for filtered retrieval (see retrieval.section_filter)"""
+    return {
+        "category": category or "General",
+        "seniority": infer_seniority(text),
+    }
+
+def iter_blocks(paths, text_field="text", category_field="category"):
+    """Stream (text, category) pairs from JSONL/CSV files, or the built-in blocks if no paths are given"""
+    if not paths:
+        for category, blocks in resume_block_groups.items():
+            for text in blocks:
+                yield text, category
+        return
+    
+    for path in paths:
+        if path.endswith(".csv"):
+            with open(path, newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    text = (row.get(text_field) or "").strip()
+                    if text:
+                        yield text, row.get(category_field) or None
+        else:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    record = json.loads(line)
+                    if isinstance(record, str):
+                        record = {text_field: record}
+                    text = record.get(text_field, "").strip()
+                    if text:
+                        yield text, record.get(category_field)
+
+def iter_batches(blocks, batch_size):
+    """Group a stream of blocks into lists of at most batch_size"""
+    batch = []
+    for block in blocks:
+        batch.append(block)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def new_blocks(collection, batch):
+    """Drop duplicates within the batch and blocks already stored in the collection"""
+    unique = {}
+    for block in batch:
+        # Plain strings are accepted as blocks without a category
+        text, category = (block, None) if isinstance(block, str) else block
+        unique.setdefault(block_id(text), (text, category))
+    existing = set(collection.get(ids=list(unique), include=[])["ids"])
+    return [(doc_id, text, category) for doc_id, (text, category) in unique.items() if doc_id not in existing]
+
+def write_blocks(collection, ids, texts, embeddings, metadatas, write_chunk_size):
+    """Upsert encoded blocks into Chroma in bulk chunks"""
+    for start in range(0, len(ids), write_chunk_size):
+        end = start + write_chunk_size
+        collection.upsert(
+            ids=ids[start:end],
+            documents=texts[start:end],
+            embeddings=embeddings[start:end],
+            metadatas=metadatas[start:end]
+        )
+
+def single_process_encoder(embed_model, encode_batch_size=128):
+    """Encode batches with the model in the current process"""
+    def encode(texts):
+        return embed_model.encode(texts, batch_size=encode_batch_size, convert_to_numpy=True)
+    return encode
+
+def multi_process_encoder(embed_model, pool, encode_batch_size=128, chunk_size=None):
+    """Shard each batch across a sentence-transformers process pool, keeping input order
+
+    By default each worker gets one even share of the batch (at least one
+    forward pass), rather than sentence-transformers' tenth of a share, which
+    splits a 1024-block batch over 8 workers into 13-block chunks.
+    """
+    workers = len(pool["processes"])
+    def encode(texts):
+        size = chunk_size or max(encode_batch_size, -(-len(texts) // workers))
+        return embed_model.encode_multi_process(texts, pool, batch_size=encode_batch_size, chunk_size=size)
+    return encode
+
+def start_encoder_pool(embed_model, workers, threads=None):
+    """Start one CPU encoding process per worker without oversubscribing cores
+
+    Each worker gets an equal share of the cores for its intra-op threads
+    unless threads is given. OMP/MKL_NUM_THREADS set by the user win over the
+    default share. The variables are only changed while the workers start, so
+    a later pool of a different size (or this process) does not inherit them.
+    """
+    overrides = {}
+    for name in ("OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+        if threads is not None or name not in os.environ:
+            overrides[name] = str(threads or max(1, (os.cpu_count() or 1) // workers))
+    saved = {name: os.environ.get(name) for name in overrides}
+    os.environ.update(overrides)
+    try:
+        # Workers read the variables when they start, so restoring afterwards is safe
+        return embed_model.start_multi_process_pool(target_devices=["cpu"] * workers)
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+def ingest(collection, encode, blocks, batch_size=1024, write_chunk_size=1000, queue_size=2):
+    """Encode and upsert a stream of blocks, overlapping encoding with writing
+
+    encode turns a list of texts into embeddings in the same order. While batch
+    N is written to Chroma, batch N+1 is deduplicated and encoded; at most
+    queue_size encoded batches wait for the writer. A single writer thread
+    upserts batches in input order.
+    """
+    stats = {"seen": 0, "added": 0, "skipped": 0, "seconds": 0.0}
+    start = time.perf_counter()
+    pending_writes = queue.Queue(maxsize=queue_size)
+    queued_ids = set()  # ids encoded but not yet written, so later batches do not add them again
+    queued_lock = threading.Lock()
+    errors = []
+    
+    def writer():
+        while True:
+            item = pending_writes.get()
+            if item is None:
+                return
+            if errors:
+                # Keep draining so the producer never blocks on a full queue
+                continue
+            ids, texts, embeddings, metadatas, seen = item
+            try:
+                write_blocks(collection, ids, texts, embeddings, metadatas, write_chunk_size)
+            except Exception as e:
+                errors.append(e)
+                continue
+            finally:
+                with queued_lock:
+                    queued_ids.difference_update(ids)
+            elapsed = time.perf_counter() - start
+            print(f"  {seen} blocks processed | {seen / elapsed:.1f} blocks/sec")
+    
+    writer_thread = threading.Thread(target=writer, name="chroma-writer", daemon=True)
+    writer_thread.start()
+    try:
+        for batch in iter_batches(blocks, batch_size):
+            if errors:
+                break
+            stats["seen"] += len(batch)
+            with queued_lock:
+                pending = [block for block in new_blocks(collection, batch) if block[0] not in queued_ids]
+            stats["skipped"] += len(batch) - len(pending)
+            if not pending:
+                continue
+            
+            ids = [doc_id for doc_id, _, _ in pending]
+            texts = [text for _, text, _ in pending]
+            metadatas = [block_metadata(text, category) for _, text, category in pending]
+            embeddings = encode(texts).tolist()
+            with queued_lock:
+                queued_ids.update(ids)
+            pending_writes.put((ids, texts, embeddings, metadatas, stats["seen"]))
+            stats["added"] += len(pending)
+    finally:
+        pending_writes.put(None)
+        writer_thread.join()
+    if errors:
+        raise errors[0]
+    
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Load resume blocks into ChromaDB")
+    parser.add_argument("inputs", nargs="*", help="JSONL or CSV files of resume blocks (defaults to the built-in blocks)")
+    parser.add_argument("--text-field", default="text", help="JSON key / CSV column holding the block text")
+    parser.add_argument("--category-field", default="category", help="JSON key / CSV column holding the block category")
+    parser.add_argument("--db-path", default="./data")
+    parser.add_argument("--collection", default="resume_blocks")
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--batch-size", type=int, default=1024, help="blocks read and deduplicated per batch")
+    parser.add_argument("--encode-batch-size", type=int, default=128, help="blocks per model forward pass")
+    parser.add_argument("--write-chunk-size", type=int, default=1000, help="blocks per Chroma upsert call")
+    parser.add_argument("--reset", action="store_true", help="drop the collection before loading (needed once to add metadata to blocks loaded by older versions)")
+    parser.add_argument("--workers", type=int, default=1, help="encoding processes (1 encodes in this process)")
+    parser.add_argument("--chunk-size", type=int, default=None, help="blocks sent to a worker at a time (default: an even share of each batch)")
+    parser.add_argument("--numpy-index", default=None, help="also export a NumPy exact-search index to this directory")
+    args = parser.parse_args()
+    
+    # Setup (heavy imports stay here so the helpers above import cheaply)
+    from sentence_transformers import SentenceTransformer
+    import chromadb
+    
+    embed_model = SentenceTransformer(args.model)
+    client = chromadb.PersistentClient(path=args.db_path)
+    if args.reset:
+        try:
+            client.delete_collection(name=args.collection)
+        except Exception:
+            pass
+    collection = client.get_or_create_collection(name=args.collection)
+    
+    pool = None
+    if args.workers > 1:
+        pool = start_encoder_pool(embed_model, args.workers)
+        encode = multi_process_encoder(embed_model, pool, args.encode_batch_size, args.chunk_size)
+    else:
+        encode = single_process_encoder(embed_model, args.encode_batch_size)
+    
+    try:
+        stats = ingest(
+            collection,
+            encode,
+            iter_blocks(args.inputs, args.text_field, args.category_field),
+            batch_size=args.batch_size,
+            write_chunk_size=args.write_chunk_size
+        )
+    finally:
+        if pool is not None:
+            embed_model.stop_multi_process_pool(pool)
+    
+    throughput = stats["seen"] / stats["seconds"] if stats["seconds"] else 0.0
+    print("✅ Resume data added to ChromaDB!")
+    print(f"📊 Blocks processed: {stats['seen']} | added: {stats['added']} | unchanged: {stats['skipped']}")
+    print(f"⚡ Throughput: {throughput:.1f} blocks/sec in {stats['seconds']:.1f}s")
+    print(f"📦 Total resume blocks in collection: {collection.count()}")
+    
+    if args.numpy_index:
+        exported = write_numpy_index(collection, args.numpy_index)
+        print(f"🧮 NumPy index with {exported} blocks written to {args.numpy_index}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import functools
+import os
+import threading
+import time
+
+# Latency buckets in seconds, from sub-millisecond retrieval up to full-length generations
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+class _Timer:
+    """Context manager and decorator that records a stage's duration"""
+
+    def __init__(self, registry, stage):
+        self.registry = registry
+        self.stage = stage
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.registry.observe(self.stage, time.perf_counter() - self._start)
+        return False
+
+    def __call__(self, fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _Timer(self.registry, self.stage):
+                return fn(*args, **kwargs)
+        return wrapper
+
+class MetricsRegistry:
+    """Per-stage latency histograms, counters and gauges with Prometheus text export"""
+
+    def __init__(self, prefix="rag"):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._counters = {}
+        self._collectors = []
+
+    def timed(self, stage):
+        """Time a block (with ...) or a function (@...) under the given stage name"""
+        return _Timer(self, stage)
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            entry = self._stages.get(stage)
+            if entry is None:
+                entry = self._stages[stage] = {"count": 0, "sum": 0.0, "max": 0.0, "buckets": [0] * len(BUCKETS)}
+            entry["count"] += 1
+            entry["sum"] += seconds
+            entry["max"] = max(entry["max"], seconds)
+            for i, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    entry["buckets"][i] += 1
+                    break
+
+    def increment(self, name, value=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def register_collector(self, collector):
+        """Register a callable returning {gauge_name: value}, sampled at export time"""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def snapshot(self):
+        """Return a copy of all stages, counters and collected gauges"""
+        with self._lock:
+            stages = {stage: dict(entry, buckets=list(entry["buckets"])) for stage, entry in self._stages.items()}
+            counters = dict(self._counters)
+            collectors = list(self._collectors)
+        gauges = {}
+        for collector in collectors:
+            try:
+                gauges.update(collector())
+            except Exception:
+                # A broken collector must never take down the request path
+                continue
+        return {"stages": stages, "counters": counters, "gauges": gauges}
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+
+    def to_prometheus(self):
+        """Render the current metrics in the Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        name = f"{self.prefix}_stage_seconds"
+        lines = [f"# HELP {name} Time spent in each pipeline stage.", f"# TYPE {name} histogram"]
+        for stage, entry in sorted(snapshot["stages"].items()):
+            cumulative = 0
+            for bound, count in zip(BUCKETS, entry["buckets"]):
+                cumulative += count
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {entry["count"]}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {entry["sum"]}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {entry["count"]}')
+        for counter, value in sorted(snapshot["counters"].items()):
+            lines.append(f"# TYPE {self.prefix}_{counter} counter")
+            lines.append(f"{self.prefix}_{counter} {value}")
+        for gauge, value in sorted(snapshot["gauges"].items()):
+            lines.append(f"# TYPE {self.prefix}_{gauge} gauge")
+            lines.append(f"{self.prefix}_{gauge} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus_file(self, path):
+        """Write metrics for the node_exporter textfile collector (atomic rename)"""
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+
+# Process-wide registry used by every pipeline module
+registry = MetricsRegistry()
+timed = registry.timed
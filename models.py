@@ -0,0 +1,189 @@
+import threading
+
+from backends import load_generator, weights_size_bytes
+from cache import CachedGenerator, GenerationCache
+from config import (
+    GENERATOR_MODEL, EMBEDDER_MODEL, GENERATOR_BACKEND, ONNX_MODEL_PATH,
+    USE_GENERATION_SCHEDULER, SCHEDULER_MAX_BATCH_SIZE, SCHEDULER_MAX_WAIT_MS,
+    GENERATION_CACHE_PATH, GENERATION_CACHE_MAX_ENTRIES, GENERATION_CACHE_TTL_SECONDS,
+    QUERY_CACHE_SIZE, QUERY_ENCODE_BATCH_SIZE, RETRIEVER_BACKEND, NUMPY_INDEX_PATH,
+    MODEL_MEMORY_BUDGET_MB, DECODING_CONTROL, SECTION_MAX_NEW_TOKENS, SECTION_MAX_UNITS, DRAFT_MODEL
+)
+from decoding import DecodingController
+from generation import MeteredGenerator, find_layer, unwrap_pipeline
+from metrics import registry
+from residency import ModelResidency, process_memory, share_after_fork
+from retrieval import ChromaRetriever, NumpyRetriever, QueryEncoder
+from scheduler import GenerationScheduler
+from startup_profile import record_load
+
+# Shared model and store construction for the Streamlit app and the headless entry points
+
+# Raw generator weights, loaded once per process (or once before forking, see preload_models)
+def _load_generator(name):
+    # Timed here, where the load really happens, so reusing preloaded weights does not reset it
+    with record_load("generator" if name == GENERATOR_MODEL else f"generator {name}"):
+        return load_generator(name, GENERATOR_BACKEND, ONNX_MODEL_PATH)
+
+generator_residency = ModelResidency(
+    _load_generator,
+    budget_mb=MODEL_MEMORY_BUDGET_MB,
+    size_hint=weights_size_bytes,
+    on_evict=lambda name, model: _release_wrapped(name)
+)
+_generation_cache = None
+_generation_cache_lock = threading.Lock()
+_wrapped_generators = {}  # model name -> extra model with its wrappers, see get_generator
+_wrapped_lock = threading.Lock()
+_embedder_models = {}
+_embedder_lock = threading.Lock()
+
+def load_embedder_model(name=EMBEDDER_MODEL):
+    """Load the raw sentence-transformers model once per process"""
+    # The warm-up thread and the first request may both get here; only one of them loads
+    with _embedder_lock:
+        if name not in _embedder_models:
+            with record_load("embedder"):
+                # Heavy ML imports are deferred until the models are first needed
+                from sentence_transformers import SentenceTransformer
+                _embedder_models[name] = SentenceTransformer(name)
+        return _embedder_models[name]
+
+def preload_models():
+    """Load the raw weights before worker processes are forked so they share them copy-on-write
+
+    Only weights are loaded here: wrappers that own threads (the scheduler) or
+    connections (the generation cache) are built per worker by build_models().
+    No inference may run before the fork, since torch's thread pools do not
+    survive it.
+    """
+    embedder = load_embedder_model()
+    generator = generator_residency.get(GENERATOR_MODEL, pin=True)
+    share_after_fork(embedder, generator)
+
+def generation_cache():
+    """The process-wide generation cache shared by every model, or None when it is disabled"""
+    global _generation_cache
+    with _generation_cache_lock:
+        if GENERATION_CACHE_PATH and _generation_cache is None:
+            _generation_cache = GenerationCache(
+                GENERATION_CACHE_PATH,
+                max_entries=GENERATION_CACHE_MAX_ENTRIES,
+                ttl_seconds=GENERATION_CACHE_TTL_SECONDS
+            )
+        return _generation_cache
+
+def wrap_generator(generator, model_name):
+    """Put token metering and the configured decoding controller, scheduler and cache around a raw generator pipeline"""
+    generator = with_decoding_control(MeteredGenerator(generator))
+    cache_model_name = f"{model_name}:{GENERATOR_BACKEND}"
+    if isinstance(generator, DecodingController):
+        # Cached text depends on the decoding limits, but not on the draft model
+        cache_model_name += f":{generator.signature()}"
+    if USE_GENERATION_SCHEDULER:
+        # One batching queue per model, shared across all sessions
+        generator = GenerationScheduler(
+            generator,
+            max_batch_size=SCHEDULER_MAX_BATCH_SIZE,
+            max_wait_ms=SCHEDULER_MAX_WAIT_MS
+        )
+    cache = generation_cache()
+    if cache is not None:
+        # Serve repeated prompts from disk before they reach the model
+        generator = CachedGenerator(generator, cache, cache_model_name)
+    return generator
+
+def _shutdown_wrappers(generator):
+    scheduler = find_layer(generator, GenerationScheduler)
+    if scheduler is not None:
+        # Already-queued prompts still finish; the thread then exits and drops the weights
+        scheduler.shutdown(wait=False)
+
+def _release_wrapped(name):
+    with _wrapped_lock:
+        wrapped = _wrapped_generators.pop(name, None)
+    if wrapped is not None:
+        _shutdown_wrappers(wrapped)
+
+def get_generator(model_name):
+    """An extra generator model with the same wrappers as the primary one, loaded on demand within the memory budget"""
+    generator = generator_residency.get(model_name)
+    stale = None
+    with _wrapped_lock:
+        wrapped = _wrapped_generators.get(model_name)
+        if wrapped is None or unwrap_pipeline(wrapped) is not generator:
+            # First use, or the model was evicted and loaded again since it was wrapped
+            stale, wrapped = wrapped, wrap_generator(generator, model_name)
+            _wrapped_generators[model_name] = wrapped
+    if stale is not None:
+        _shutdown_wrappers(stale)
+    return wrapped
+
+def build_models():
+    """Load the embedding and generation models as configured"""
+    embedder = QueryEncoder(
+        load_embedder_model(),
+        cache_size=QUERY_CACHE_SIZE,
+        batch_size=QUERY_ENCODE_BATCH_SIZE
+    )
+    # The primary model is pinned: its wrappers keep a reference to it anyway
+    generator = wrap_generator(generator_residency.get(GENERATOR_MODEL, pin=True), GENERATOR_MODEL)
+    
+    # Cache hit rates are sampled whenever metrics are exported
+    registry.register_collector(lambda: {
+        "query_cache_hit_rate": embedder.stats()["hit_rate"],
+        "query_cache_entries": embedder.stats()["entries"],
+    })
+    cache = generation_cache()
+    if cache is not None:
+        registry.register_collector(lambda: {
+            "generation_cache_hit_rate": cache.stats()["hit_rate"],
+            "generation_cache_entries": cache.stats()["entries"],
+        })
+    scheduler = find_layer(generator, GenerationScheduler)
+    if scheduler is not None:
+        registry.register_collector(lambda: {
+            "scheduler_queue_depth": scheduler.metrics()["queue_depth"],
+            "scheduler_avg_batch_size": scheduler.metrics()["avg_batch_size"],
+        })
+    registry.register_collector(memory_metrics)
+    return embedder, generator
+
+def with_decoding_control(generator):
+    """Wrap a raw generator pipeline in the configured per-section decoding controller"""
+    if not DECODING_CONTROL:
+        return generator
+    assistant_model = None
+    if DRAFT_MODEL:
+        if GENERATOR_BACKEND != "pytorch":
+            raise ValueError("Assisted decoding with RAG_DRAFT_MODEL needs RAG_GENERATOR_BACKEND=pytorch")
+        assistant_model = generator_residency.get(DRAFT_MODEL, pin=True).model
+    return DecodingController(generator, SECTION_MAX_NEW_TOKENS, SECTION_MAX_UNITS, assistant_model=assistant_model)
+
+def memory_metrics():
+    """Per-process memory and model residency gauges"""
+    memory = process_memory()
+    residency = generator_residency.stats()
+    values = {
+        "process_rss_mb": memory["rss_mb"],
+        "process_pss_mb": memory["pss_mb"],
+        "process_shared_mb": memory["shared_mb"],
+        "resident_generator_models": len(residency["resident"]),
+        "resident_generator_mb": residency["resident_mb"],
+        "generator_evictions": residency["evictions"],
+    }
+    return {name: value for name, value in values.items() if value is not None}
+
+def build_collection(path="./data", name="resume_blocks"):
+    """Open the ChromaDB collection of resume blocks"""
+    with record_load("chromadb"):
+        import chromadb
+        client = chromadb.PersistentClient(path=path)
+        collection = client.get_or_create_collection(name=name)
+    return collection
+
+def build_retriever(collection=None):
+    """Create the configured retrieval backend"""
+    if RETRIEVER_BACKEND == "numpy":
+        return NumpyRetriever(NUMPY_INDEX_PATH)
+    return ChromaRetriever(collection if collection is not None else build_collection())
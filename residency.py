@@ -0,0 +1,222 @@
+import ctypes
+import gc
+import os
+import threading
+import time
+from collections import OrderedDict
+
+MIB = 1024 * 1024
+
+def process_memory():
+    """Resident, proportional and shared memory of this process in MiB (Linux only)
+
+    RSS counts every page a process maps, so workers sharing preloaded weights
+    each report the full model. PSS splits shared pages between the processes
+    using them, so summing PSS across workers gives the real footprint.
+    """
+    fields = {}
+    for path in ("/proc/self/status", "/proc/self/smaps_rollup"):
+        try:
+            with open(path) as f:
+                for line in f:
+                    key, _, value = line.partition(":")
+                    if value.strip().endswith("kB"):
+                        fields[key] = int(value.split()[0]) / 1024
+        except OSError:
+            continue
+    return {
+        "pid": os.getpid(),
+        "rss_mb": fields.get("VmRSS"),
+        "pss_mb": fields.get("Pss"),
+        "shared_mb": fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0) if "Pss" in fields else None,
+    }
+
+def _state_tensors(value):
+    if hasattr(value, "numel") and hasattr(value, "element_size"):
+        yield value
+    elif isinstance(value, (tuple, list)):
+        for item in value:
+            yield from _state_tensors(item)
+
+def model_size_bytes(model):
+    """Bytes held by a torch model's weights, or None if it is not a torch model
+
+    Sized from state_dict() rather than parameters(): dynamically quantized
+    Linear layers (the int8 backend) keep their weights in packed params
+    that are neither parameters nor buffers, but do appear in the state dict.
+    """
+    module = getattr(model, "model", model)
+    if not callable(getattr(module, "state_dict", None)):
+        return None
+    # Tied weights appear under several keys but are the same tensor object
+    tensors = {}
+    for value in module.state_dict(keep_vars=True).values():
+        for tensor in _state_tensors(value):
+            tensors[id(tensor)] = tensor
+    return sum(tensor.numel() * tensor.element_size() for tensor in tensors.values())
+
+def release_memory():
+    """Collect unreachable objects and hand freed heap pages back to the OS"""
+    gc.collect()
+    try:
+        # glibc keeps freed arenas mapped, which hides evictions from RSS otherwise
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+def share_after_fork(*models):
+    """Prepare preloaded models to be shared copy-on-write by forked worker processes
+
+    Weights are only read during inference, so their pages stay shared until a
+    worker writes to them. Disabling autograd keeps inference from touching
+    parameter state, and gc.freeze() moves everything loaded so far out of the
+    collector's reach so its bookkeeping does not dirty the shared pages.
+    """
+    for model in models:
+        module = getattr(model, "model", model)
+        if callable(getattr(module, "eval", None)):
+            module.eval()
+        if callable(getattr(module, "parameters", None)):
+            for parameter in module.parameters():
+                parameter.requires_grad_(False)
+    gc.collect()
+    gc.freeze()
+
+class ModelResidency:
+    """Load models by name on demand and unload the least recently used ones beyond a memory budget
+
+    The loader is called at most once per resident model, so every caller in
+    the process shares the same weights. Loads run outside the lock, so stats
+    and already-resident models stay available while a model loads. Room is
+    made before a load, using the model's size from an earlier load or
+    size_hint(name), so peak memory stays within the budget. Pinned models
+    are never unloaded. Unloading drops this manager's reference (on_evict is
+    told, so wrappers can be released too); memory is freed once no other
+    caller still holds the model.
+    """
+
+    def __init__(self, loader, budget_mb=0, size_hint=None, on_evict=None):
+        self.loader = loader
+        self.budget_bytes = budget_mb * MIB
+        self.size_hint = size_hint
+        self.on_evict = on_evict
+        self.load_seconds = {}
+        self.loads = 0
+        self.evictions = 0
+        self._models = OrderedDict()  # name -> (model, size in bytes), least recently used first
+        self._sizes = {}  # name -> measured size, kept after eviction for the next load
+        self._loading = {}  # name -> (Event set when the load ends, bytes reserved for it)
+        self._pinned = set()
+        self._lock = threading.Lock()
+
+    def get(self, name, pin=False):
+        """Return the named model, loading it (and evicting others first) if it is not resident"""
+        while True:
+            with self._lock:
+                if pin:
+                    self._pinned.add(name)
+                if name in self._models:
+                    self._models.move_to_end(name)
+                    return self._models[name][0]
+                loading = self._loading.get(name)
+                known_size = self._sizes.get(name)
+            if loading is not None:
+                # Another thread is loading this model; wait for it rather than load it twice
+                loading[0].wait()
+                continue
+            # Estimated outside the lock, since a size hint may read model files
+            expected = known_size if known_size is not None else (self.size_hint(name) if self.size_hint else 0) or 0
+            with self._lock:
+                if name in self._models or name in self._loading:
+                    continue
+                event = threading.Event()
+                self._loading[name] = (event, expected)
+                evicted = self._evict()
+            break
+        self._released(evicted)
+
+        try:
+            rss_before = process_memory()["rss_mb"]
+            start = time.perf_counter()
+            model = self.loader(name)
+            load_seconds = time.perf_counter() - start
+            size = model_size_bytes(model)
+            if size is None and rss_before is not None:
+                # Non-torch backends (e.g. ONNX Runtime) are sized by how much RSS the load added
+                size = max(process_memory()["rss_mb"] - rss_before, 0) * MIB
+        except BaseException:
+            with self._lock:
+                self._loading.pop(name)
+            event.set()
+            raise
+        with self._lock:
+            self._loading.pop(name)
+            self.load_seconds[name] = load_seconds
+            self.loads += 1
+            self._sizes[name] = size or 0
+            self._models[name] = (model, size or 0)
+            # Correct for an estimate that was too low now that the real size is known
+            evicted = self._evict(keep=name)
+        event.set()
+        self._released(evicted)
+        return model
+
+    def _evict(self, keep=None):
+        """Drop least recently used models until resident and loading bytes fit the budget; call with the lock held"""
+        evicted = []
+        if not self.budget_bytes:
+            return evicted
+        # Models still loading count at their expected size
+        in_flight = sum(size for _, size in self._loading.values())
+        while self.resident_bytes() + in_flight > self.budget_bytes:
+            victim = next((name for name in self._models if name != keep and name not in self._pinned), None)
+            if victim is None:
+                break
+            evicted.append((victim, self._models.pop(victim)[0]))
+            self.evictions += 1
+        return evicted
+
+    def _released(self, evicted):
+        # Runs outside the lock: callbacks and gc can take a while
+        if not evicted:
+            return
+        while evicted:
+            name, model = evicted.pop()
+            if self.on_evict is not None:
+                self.on_evict(name, model)
+        # Drop the last reference held here before handing memory back
+        model = None
+        release_memory()
+
+    def unload(self, name):
+        """Drop a model even if it is pinned"""
+        with self._lock:
+            self._pinned.discard(name)
+            entry = self._models.pop(name, None)
+        if entry is not None:
+            evicted, entry = [(name, entry[0])], None
+            self._released(evicted)
+
+    def resident_bytes(self):
+        return sum(size for _, size in self._models.values())
+
+    def stats(self):
+        """Resident models, their total size against the budget, and load/eviction counts
+
+        Only holds the lock to copy bookkeeping, never across a load, so it is
+        safe to call from an event loop.
+        """
+        with self._lock:
+            resident = list(self._models)
+            resident_bytes = self.resident_bytes()
+            loading = list(self._loading)
+            load_seconds = dict(self.load_seconds)
+        return {
+            "resident": resident,
+            "resident_mb": resident_bytes / MIB,
+            "budget_mb": self.budget_bytes / MIB,
+            "loading": loading,
+            "loads": self.loads,
+            "evictions": self.evictions,
+            "load_seconds": load_seconds,
+        }
@@ -0,0 +1,272 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from metrics import timed
+
+def normalize_query(query):
+    """Normalize a query so trivially different spellings share a cache entry"""
+    # all-MiniLM-L6-v2 uses an uncased tokenizer, so lowercasing does not change the embedding
+    return " ".join(query.lower().split())
+
+class QueryEncoder:
+    """SentenceTransformer wrapper with an in-process LRU cache of query embeddings"""
+
+    def __init__(self, model, cache_size=1024, batch_size=64):
+        self.model = model
+        self.cache_size = cache_size
+        self.batch_size = batch_size
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def encode(self, query):
+        """Encode one query, returning a float32 vector"""
+        return self.encode_batch([query])[0]
+
+    def encode_batch(self, queries, batch_size=None):
+        """Encode many queries with a single model call for all cache misses"""
+        keys = [normalize_query(query) for query in queries]
+        vectors = [None] * len(keys)
+        
+        with self._lock:
+            for i, key in enumerate(keys):
+                vector = self._cache.get(key)
+                if vector is not None:
+                    self._cache.move_to_end(key)
+                    vectors[i] = vector
+                    self.hits += 1
+                else:
+                    self.misses += 1
+        
+        # Encode each distinct missing query once
+        missing = list(dict.fromkeys(key for key, vector in zip(keys, vectors) if vector is None))
+        if missing:
+            with timed("embed"):
+                encoded = self.model.encode(missing, batch_size=batch_size or self.batch_size, convert_to_numpy=True)
+            encoded = np.asarray(encoded, dtype=np.float32)
+            fresh = dict(zip(missing, encoded))
+            with self._lock:
+                for key, vector in fresh.items():
+                    self._cache[key] = vector
+                    self._cache.move_to_end(key)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+            vectors = [vector if vector is not None else fresh[key] for key, vector in zip(keys, vectors)]
+        
+        return np.stack(vectors) if vectors else np.empty((0, 0), dtype=np.float32)
+
+    def stats(self):
+        """Return cache size and hit rate"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._cache),
+            "capacity": self.cache_size,
+        }
+
+class ChromaRetriever:
+    """Retriever backed by a Chroma collection"""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    @timed("retrieve")
+    def query(self, query_embeddings, n_results=8, with_embeddings=False, where=None):
+        include = ["documents", "metadatas", "distances"] + (["embeddings"] if with_embeddings else [])
+        return self.collection.query(
+            query_embeddings=query_embeddings, n_results=n_results, include=include, where=where
+        )
+
+class NumpyRetriever:
+    """Exact top-k search over a memory-mapped, normalized float32 embedding matrix
+
+    Results use the same shape as Chroma's query() so the two backends are
+    interchangeable. Distances are squared L2 between unit vectors, matching
+    Chroma's default "l2" space.
+    """
+
+    def __init__(self, index_dir):
+        self.index_dir = index_dir
+        self.embeddings = np.load(os.path.join(index_dir, "embeddings.npy"), mmap_mode="r")
+        with open(os.path.join(index_dir, "documents.json"), encoding="utf-8") as f:
+            records = json.load(f)
+        self.ids = records["ids"]
+        self.documents = records["documents"]
+        self.metadatas = records.get("metadatas") or [{} for _ in self.ids]
+        self._masks = {}
+
+    def _where_mask(self, where):
+        """Boolean mask of blocks whose metadata satisfies a Chroma-style where filter"""
+        key = json.dumps(where, sort_keys=True)
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = np.fromiter((metadata_matches(metadata, where) for metadata in self.metadatas), dtype=bool)
+            self._masks[key] = mask
+        return mask
+
+    @timed("retrieve")
+    def query(self, query_embeddings, n_results=8, with_embeddings=False, where=None):
+        queries = np.asarray(query_embeddings, dtype=np.float32).reshape(-1, self.embeddings.shape[1])
+        queries = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+        k = min(n_results, len(self.ids))
+        
+        # One matrix product scores every query against every block
+        scores = queries @ self.embeddings.T
+        if where:
+            mask = self._where_mask(where)
+            scores[:, ~mask] = -np.inf
+            k = min(k, int(mask.sum()))
+        if k == 0:
+            empty = [[] for _ in range(len(queries))]
+            return {"ids": empty, "documents": empty, "metadatas": empty, "distances": empty, "embeddings": empty}
+        if k < scores.shape[1]:
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.tile(np.arange(scores.shape[1]), (scores.shape[0], 1))
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+        
+        results = {
+            "ids": [[self.ids[i] for i in row] for row in top],
+            "documents": [[self.documents[i] for i in row] for row in top],
+            "metadatas": [[self.metadatas[i] for i in row] for row in top],
+            "distances": (2.0 - 2.0 * top_scores).tolist(),
+        }
+        if with_embeddings:
+            results["embeddings"] = [np.asarray(self.embeddings[row]) for row in top]
+        return results
+
+def metadata_matches(metadata, where):
+    """Evaluate the subset of Chroma where filters used here ($eq, $ne, $in, $nin, $and, $or)"""
+    for field, condition in where.items():
+        if field == "$and":
+            if not all(metadata_matches(metadata, clause) for clause in condition):
+                return False
+            continue
+        if field == "$or":
+            if not any(metadata_matches(metadata, clause) for clause in condition):
+                return False
+            continue
+        value = metadata.get(field)
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+        for op, operand in condition.items():
+            if op == "$eq" and value != operand:
+                return False
+            if op == "$ne" and value == operand:
+                return False
+            if op == "$in" and value not in operand:
+                return False
+            if op == "$nin" and value in operand:
+                return False
+    return True
+
+# Block categories that feed each section; None means the whole corpus
+SECTION_CATEGORIES = {
+    "summary": None,
+    "experience": [
+        "Industry Experience", "Leadership & Innovation", "Project Management", "Soft Skills",
+        "Database & Backend", "Cloud & DevOps",
+    ],
+    "skills": [
+        "Technical Skills - Programming", "Data Science & ML", "Cloud & DevOps", "Database & Backend",
+        "Frontend & UI/UX", "Version Control & Tools",
+    ],
+    "projects": [
+        "Research & Development", "Leadership & Innovation", "Data Science & ML",
+        "Technical Skills - Programming", "Frontend & UI/UX",
+    ],
+    "education": ["Education & Certifications"],
+}
+
+# Experience levels offered in the app -> block seniority (see skills.infer_seniority) they draw on
+EXPERIENCE_SENIORITY = {
+    "Entry Level": "entry",
+    "Mid Level": "mid",
+    "Senior Level": "senior",
+    "Lead/Manager": "senior",
+}
+
+def section_filter(categories, experience_level=None):
+    """Chroma where filter for a section's categories and, if known, the candidate's seniority"""
+    clauses = []
+    if categories:
+        clauses.append({"category": {"$in": categories}})
+    seniority = EXPERIENCE_SENIORITY.get(experience_level)
+    if seniority:
+        # Blocks with no seniority signal suit every level
+        clauses.append({"seniority": {"$in": [seniority, "any"]}})
+    if not clauses:
+        return None
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+def merge_results(results, extra, n_results):
+    """Append extra's hits that results lacks, up to n_results, for a single-query result"""
+    seen = set(results["ids"][0])
+    added = [i for i, doc_id in enumerate(extra["ids"][0]) if doc_id not in seen][:n_results - len(seen)]
+    merged = dict(results)
+    for key in ("ids", "documents", "metadatas", "distances", "embeddings"):
+        if results.get(key) is not None and extra.get(key) is not None:
+            merged[key] = [list(results[key][0]) + [extra[key][0][i] for i in added]]
+    return merged
+
+def retrieve_for_sections(retriever, query_embedding, n_results=4, section_categories=None, with_embeddings=False,
+                          experience_level=None):
+    """Run one category-filtered query per section so each prompt gets a small, targeted context
+
+    With an experience level, blocks written for another seniority are left
+    out. If that leaves fewer than n_results blocks, the section is topped up
+    from its categories regardless of seniority.
+    """
+    section_categories = section_categories or SECTION_CATEGORIES
+    
+    def query(where):
+        return retriever.query(
+            query_embeddings=[query_embedding],
+            n_results=n_results,
+            with_embeddings=with_embeddings,
+            where=where
+        )
+    
+    results = {}
+    for section_type, categories in section_categories.items():
+        results[section_type] = query(section_filter(categories, experience_level))
+        if experience_level in EXPERIENCE_SENIORITY and len(results[section_type]["ids"][0]) < n_results:
+            results[section_type] = merge_results(results[section_type], query(section_filter(categories)), n_results)
+    return results
+
+def write_numpy_index(collection, index_dir, page_size=10000):
+    """Export a Chroma collection to a normalized .npy matrix plus ids, documents and metadata"""
+    os.makedirs(index_dir, exist_ok=True)
+    total = collection.count()
+    ids, documents, metadatas = [], [], []
+    matrix = None
+    
+    # Page through the collection so the export never holds every embedding twice
+    for offset in range(0, total, page_size):
+        page = collection.get(include=["embeddings", "documents", "metadatas"], limit=page_size, offset=offset)
+        vectors = np.asarray(page["embeddings"], dtype=np.float32)
+        if matrix is None:
+            matrix = np.lib.format.open_memmap(
+                os.path.join(index_dir, "embeddings.npy"), mode="w+", dtype=np.float32, shape=(total, vectors.shape[1])
+            )
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        matrix[offset:offset + len(vectors)] = vectors
+        ids.extend(page["ids"])
+        documents.extend(page["documents"])
+        metadatas.extend(metadata or {} for metadata in page["metadatas"])
+    
+    if matrix is not None:
+        matrix.flush()
+    with open(os.path.join(index_dir, "documents.json"), "w", encoding="utf-8") as f:
+        json.dump({"ids": ids, "documents": documents, "metadatas": metadatas}, f)
+    return len(ids)
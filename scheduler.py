@@ -0,0 +1,138 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+class GenerationScheduler:
+    """Micro-batch prompts from many sessions into shared generator calls
+
+    Prompts are queued from any thread and flushed to the wrapped generator as
+    one batch once max_batch_size prompts are waiting or the oldest prompt has
+    waited max_wait_ms. Each caller gets its result back through a Future.
+    The scheduler is itself callable with the pipeline signature, so it can be
+    passed anywhere a generator is expected.
+    """
+
+    def __init__(self, generator, max_batch_size=8, max_wait_ms=20):
+        self.generator = generator
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._stats = {
+            "batches": 0,
+            "prompts": 0,
+            "max_batch_size": 0,
+            "total_wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+        }
+        self._running = True
+        self._worker = threading.Thread(target=self._run, name="generation-scheduler", daemon=True)
+        self._worker.start()
+
+    def submit(self, prompt, **generation_kwargs):
+        """Queue a single prompt and return a Future for its generated text"""
+        if not self._running:
+            raise RuntimeError("GenerationScheduler has been shut down")
+        future = Future()
+        # Only prompts with identical decoding parameters can share a batch; the section type is
+        # passed per prompt, so sections with different decoding limits still batch together
+        key = tuple(sorted((k, v) for k, v in generation_kwargs.items() if k != "section_type"))
+        self._queue.put((key, prompt, generation_kwargs, future, time.perf_counter()))
+        return future
+
+    def __call__(self, prompts, **generation_kwargs):
+        """Pipeline-compatible entry point that blocks until results are ready"""
+        # The scheduler picks its own batch size across callers
+        generation_kwargs.pop("batch_size", None)
+        if isinstance(prompts, str):
+            return [{"generated_text": self.submit(prompts, **generation_kwargs).result()}]
+        section_types = generation_kwargs.pop("section_type", None)
+        if not isinstance(section_types, (list, tuple)):
+            section_types = [section_types] * len(prompts)
+        futures = [
+            self.submit(prompt, **generation_kwargs, **({"section_type": section_type} if section_type else {}))
+            for prompt, section_type in zip(prompts, section_types)
+        ]
+        return [[{"generated_text": future.result()}] for future in futures]
+
+    def metrics(self):
+        """Return queue depth, batch size and wait time statistics"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["queue_depth"] = self._queue.qsize()
+        stats["avg_batch_size"] = stats["prompts"] / stats["batches"] if stats["batches"] else 0.0
+        stats["avg_wait_seconds"] = stats["total_wait_seconds"] / stats["prompts"] if stats["prompts"] else 0.0
+        return stats
+
+    def shutdown(self, wait=True):
+        """Stop the worker thread after draining already-queued prompts"""
+        self._running = False
+        self._queue.put(None)
+        if wait:
+            self._worker.join()
+
+    def _collect_batch(self, first):
+        """Gather prompts until the batch is full or the flush deadline passes"""
+        batch = [first]
+        deferred = []
+        deadline = first[4] + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                # Past the deadline, still take whatever is already waiting
+                if remaining > 0:
+                    item = self._queue.get(timeout=remaining)
+                else:
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                deferred.append(item)
+                break
+            if item[0] == first[0]:
+                batch.append(item)
+            else:
+                deferred.append(item)
+        # Requeue prompts with other decoding parameters (and the shutdown marker)
+        for item in deferred:
+            self._queue.put(item)
+        return batch
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                if self._queue.empty():
+                    break
+                # Let remaining prompts drain before stopping
+                self._queue.put(None)
+                continue
+            batch = self._collect_batch(item)
+            self._flush(batch)
+
+    def _flush(self, batch):
+        started = time.perf_counter()
+        prompts = [item[1] for item in batch]
+        generation_kwargs = dict(batch[0][2])
+        if any("section_type" in item[2] for item in batch):
+            generation_kwargs["section_type"] = [item[2].get("section_type") for item in batch]
+        waits = [started - item[4] for item in batch]
+
+        with self._lock:
+            self._stats["batches"] += 1
+            self._stats["prompts"] += len(batch)
+            self._stats["max_batch_size"] = max(self._stats["max_batch_size"], len(batch))
+            self._stats["total_wait_seconds"] += sum(waits)
+            self._stats["max_wait_seconds"] = max(self._stats["max_wait_seconds"], max(waits))
+
+        try:
+            outputs = self.generator(prompts, batch_size=len(prompts), **generation_kwargs)
+        except Exception as exc:
+            for item in batch:
+                item[3].set_exception(exc)
+            return
+
+        for item, output in zip(batch, outputs):
+            candidate = output[0] if isinstance(output, list) else output
+            item[3].set_result(candidate["generated_text"])
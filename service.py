@@ -0,0 +1,189 @@
+"""Async HTTP service in front of the RAG resume pipeline.
+
+Usage: uvicorn service:app --host 0.0.0.0 --port 8000
+
+Several workers can share one copy of the model weights: with
+RAG_PRELOAD_MODELS=1 the weights are loaded when this module is imported, so
+a pre-forking server shares them copy-on-write across its workers, e.g.
+RAG_PRELOAD_MODELS=1 gunicorn service:app -k uvicorn.workers.UvicornWorker --preload -w 4
+
+Model inference runs on a bounded thread pool. Requests beyond the pending
+limit are rejected with 429 instead of queueing without bound, and requests
+that wait longer than the timeout get a 504.
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse, Response
+from pydantic import BaseModel
+
+from config import (
+    GENERATION_BATCH_SIZE, GENERATOR_MODEL, GENERATOR_MODELS, PRELOAD_MODELS,
+    SERVICE_INFERENCE_WORKERS, SERVICE_MAX_PENDING, SERVICE_TIMEOUT_SECONDS
+)
+from export import create_docx_resume, create_pdf_resume, format_text_resume
+from metrics import registry
+from generation import SECTION_TYPES, generate_section, generate_sections_batched
+from models import build_models, build_retriever, generator_residency, get_generator, preload_models
+from residency import process_memory
+
+class InferenceLimiter:
+    """Bounded executor with admission control and per-request timeouts"""
+
+    def __init__(self, workers, max_pending, timeout_seconds):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="inference")
+        self.max_pending = max_pending
+        self.timeout_seconds = timeout_seconds
+        self.pending = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._lock = threading.Lock()
+
+    def _release(self, _future):
+        with self._lock:
+            self.pending -= 1
+
+    async def run(self, fn, *args):
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise HTTPException(status_code=429, detail="Server busy, retry later", headers={"Retry-After": "1"})
+            self.pending += 1
+        
+        # The slot is released when the work finishes (or is cancelled while queued),
+        # not when the client gives up, so admission reflects real executor load
+        future = self.executor.submit(fn, *args)
+        future.add_done_callback(self._release)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout_seconds)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise HTTPException(status_code=504, detail="Inference timed out")
+
+class RetrieveRequest(BaseModel):
+    query: str
+    n_results: int = 8
+
+class GenerateRequest(BaseModel):
+    job_role: str
+    context: Optional[str] = None
+    n_results: int = 8
+    experience_level: Optional[str] = None
+    industry: Optional[str] = None
+    model: Optional[str] = None
+
+class ResumeRequest(BaseModel):
+    job_role: str
+    n_results: int = 8
+    experience_level: Optional[str] = None
+    industry: Optional[str] = None
+    format: str = "json"
+
+state = {}
+
+if PRELOAD_MODELS:
+    # Runs in the server's master process before it forks workers
+    preload_models()
+
+@asynccontextmanager
+async def lifespan(app):
+    state["embedder"], state["generator"] = build_models()
+    state["retriever"] = build_retriever()
+    state["limiter"] = limiter = InferenceLimiter(SERVICE_INFERENCE_WORKERS, SERVICE_MAX_PENDING, SERVICE_TIMEOUT_SECONDS)
+    registry.register_collector(lambda: {
+        "service_pending_requests": limiter.pending,
+        "service_rejected_requests": limiter.rejected,
+        "service_timed_out_requests": limiter.timed_out,
+    })
+    yield
+    state["limiter"].executor.shutdown(wait=False)
+
+app = FastAPI(title="RAG Resume Generator", lifespan=lifespan)
+
+def retrieve(query, n_results):
+    """Embed the query and fetch the closest resume blocks"""
+    query_embedding = state["embedder"].encode(query)
+    return state["retriever"].query(query_embeddings=[query_embedding], n_results=n_results)
+
+def retrieve_context(query, n_results):
+    results = retrieve(query, n_results)
+    return " ".join([doc for result in results["documents"] for doc in result])
+
+@app.post("/retrieve")
+async def retrieve_endpoint(request: RetrieveRequest):
+    results = await state["limiter"].run(retrieve, request.query, request.n_results)
+    return {
+        "ids": results["ids"][0],
+        "documents": results["documents"][0],
+        "distances": results["distances"][0] if results.get("distances") else None,
+    }
+
+@app.post("/generate/{section}")
+async def generate_endpoint(section: str, request: GenerateRequest):
+    if section not in SECTION_TYPES:
+        raise HTTPException(status_code=404, detail=f"Unknown section '{section}'")
+    if request.model is not None and request.model not in GENERATOR_MODELS:
+        raise HTTPException(status_code=400, detail=f"Unknown model '{request.model}'")
+    
+    def work():
+        context = request.context if request.context is not None else retrieve_context(request.job_role, request.n_results)
+        generator = state["generator"]
+        if request.model not in (None, GENERATOR_MODEL):
+            # Extra models are loaded on demand, unloaded LRU-first beyond the memory budget,
+            # and get the same decoding controller, scheduler and cache as the primary model
+            generator = get_generator(request.model)
+        return generate_section(
+            request.job_role, context, section, generator, request.experience_level, request.industry
+        )
+    
+    text = await state["limiter"].run(work)
+    return {"section": section, "text": text}
+
+@app.post("/resume")
+async def resume_endpoint(request: ResumeRequest):
+    if request.format not in ("json", "txt", "pdf", "docx"):
+        raise HTTPException(status_code=400, detail=f"Unknown format '{request.format}'")
+    
+    def work():
+        context = retrieve_context(request.job_role, request.n_results)
+        return generate_sections_batched(
+            request.job_role, context, state["generator"],
+            batch_size=GENERATION_BATCH_SIZE,
+            experience_level=request.experience_level,
+            industry=request.industry
+        )
+    
+    sections = await state["limiter"].run(work)
+    if request.format == "txt":
+        return PlainTextResponse(format_text_resume(sections))
+    if request.format == "pdf":
+        # Rendering is CPU-bound too, so keep it off the event loop
+        pdf = await asyncio.get_running_loop().run_in_executor(None, create_pdf_resume, sections)
+        return Response(pdf.getvalue(), media_type="application/pdf")
+    if request.format == "docx":
+        docx = await asyncio.get_running_loop().run_in_executor(None, create_docx_resume, sections)
+        return Response(
+            docx.getvalue(),
+            media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+        )
+    return {"job_role": request.job_role, "sections": sections}
+
+@app.get("/metrics")
+async def metrics():
+    return PlainTextResponse(registry.to_prometheus(), media_type="text/plain; version=0.0.4")
+
+@app.get("/health")
+async def health():
+    limiter = state["limiter"]
+    return {
+        "status": "ok",
+        "pending": limiter.pending,
+        "rejected": limiter.rejected,
+        "timed_out": limiter.timed_out,
+        "memory": process_memory(),
+        "models": generator_residency.stats(),
+    }
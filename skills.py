@@ -0,0 +1,57 @@
+import re
+
+# Lower-case keyword -> display name
+SKILL_KEYWORDS = {
+    'python': 'Python', 'javascript': 'JavaScript', 'java': 'Java', 'react': 'React',
+    'node.js': 'Node.js', 'aws': 'AWS', 'docker': 'Docker', 'kubernetes': 'Kubernetes',
+    'machine learning': 'Machine Learning', 'ml': 'Machine Learning', 'ai': 'AI',
+    'data science': 'Data Science', 'sql': 'SQL', 'nosql': 'NoSQL',
+    'git': 'Git', 'agile': 'Agile', 'scrum': 'Scrum', 'devops': 'DevOps',
+    'frontend': 'Frontend', 'backend': 'Backend', 'full-stack': 'Full-Stack',
+    'cloud': 'Cloud Computing', 'microservices': 'Microservices',
+    'typescript': 'TypeScript', 'angular': 'Angular', 'flask': 'Flask', 'spring boot': 'Spring Boot',
+    'c++': 'C++', 'pandas': 'Pandas', 'numpy': 'NumPy', 'tensorflow': 'TensorFlow', 'pytorch': 'PyTorch',
+    'scikit-learn': 'scikit-learn', 'nlp': 'NLP', 'gcp': 'GCP', 'terraform': 'Terraform',
+    'jenkins': 'Jenkins', 'ci/cd': 'CI/CD', 'postgresql': 'PostgreSQL', 'mysql': 'MySQL',
+    'mongodb': 'MongoDB', 'redis': 'Redis', 'graphql': 'GraphQL', 'kafka': 'Kafka',
+    'rabbitmq': 'RabbitMQ', 'rest api': 'REST APIs', 'rest apis': 'REST APIs', 'restful': 'REST APIs',
+    'blockchain': 'Blockchain', 'iot': 'IoT',
+    'computer vision': 'Computer Vision', 'deep learning': 'Deep Learning'
+}
+
+def compile_skill_matcher(keywords):
+    """Compile all keywords into one alternation that matches whole terms only"""
+    # Longest keywords first so "machine learning" wins over shorter overlaps
+    alternation = "|".join(re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True))
+    # Only word characters block a match, so "AI/ML" and "SQL-heavy" still match; "+" keeps "c" out of "c++"
+    return re.compile(rf"(?<!\w)(?:{alternation})(?![\w+])", re.IGNORECASE)
+
+SKILL_PATTERN = compile_skill_matcher(SKILL_KEYWORDS)
+
+def extract_skills(text):
+    """Return the distinct skills mentioned in text, in order of first mention"""
+    found = {}
+    for match in SKILL_PATTERN.finditer(text):
+        skill = SKILL_KEYWORDS[match.group(0).lower()]
+        found.setdefault(skill, None)
+    return list(found)
+
+SENIOR_PATTERN = re.compile(r"\b(senior|lead\w*|led|principal|staff|manager|mentor\w*|architect)\b", re.IGNORECASE)
+# "junior" as the object of mentoring or managing describes someone else, not the candidate
+OTHERS_JUNIOR_PATTERN = re.compile(
+    r"\b(?:mentor|coach|train|manag|supervis|lead|onboard)\w*\s+(?:(?:a|the|of|and|new|other)\s+)*junior\b",
+    re.IGNORECASE
+)
+ENTRY_PATTERN = re.compile(r"\b(junior|entry|intern|graduate|familiar(?:ity)?)\b", re.IGNORECASE)
+YEARS_PATTERN = re.compile(r"(\d+)\+?\s*years", re.IGNORECASE)
+
+def infer_seniority(text):
+    """Rough seniority of a block or query: entry, mid, senior, or any if nothing signals it"""
+    years = YEARS_PATTERN.search(text)
+    if years:
+        return "senior" if int(years.group(1)) >= 5 else "mid"
+    if SENIOR_PATTERN.search(text):
+        return "senior"
+    if ENTRY_PATTERN.search(OTHERS_JUNIOR_PATTERN.sub("", text)):
+        return "entry"
+    return "any"
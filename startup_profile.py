@@ -0,0 +1,84 @@
+"""Break down app start-up time into per-component import and load times.
+
+Usage: python startup_profile.py [--skip-models]
+"""
+import argparse
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+
+# Heavy imports used by the app, each timed in a fresh interpreter
+IMPORT_COMPONENTS = [
+    ("streamlit", "import streamlit"),
+    ("torch", "import torch"),
+    ("transformers", "from transformers import pipeline"),
+    ("sentence_transformers", "from sentence_transformers import SentenceTransformer"),
+    ("chromadb", "import chromadb"),
+    ("reportlab", "import reportlab.platypus"),
+    ("docx", "import docx"),
+]
+
+# Load times recorded by the running app, component -> seconds
+load_timings = {}
+
+@contextmanager
+def record_load(component):
+    """Record how long loading a component takes"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        load_timings[component] = time.perf_counter() - start
+
+def measure_import(statement):
+    """Time one import statement in a fresh interpreter so nothing is already cached"""
+    code = f"import time; start = time.perf_counter(); {statement}; print(time.perf_counter() - start)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    return float(result.stdout.strip().splitlines()[-1])
+
+def measure_model_loads():
+    """Load each model and the vector store once, recording the time for each"""
+    from backends import load_generator
+    from config import EMBEDDER_MODEL, GENERATOR_BACKEND, GENERATOR_MODEL, ONNX_MODEL_PATH
+    
+    with record_load("embedder"):
+        from sentence_transformers import SentenceTransformer
+        embedder = SentenceTransformer(EMBEDDER_MODEL)
+    with record_load("generator"):
+        generator = load_generator(GENERATOR_MODEL, GENERATOR_BACKEND, ONNX_MODEL_PATH)
+    with record_load("chromadb"):
+        import chromadb
+        chromadb.PersistentClient(path="./data").get_or_create_collection(name="resume_blocks")
+    with record_load("warm-up inference"):
+        embedder.encode("warm up")
+        generator("warm up", max_length=8)
+    return dict(load_timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--skip-models", action="store_true", help="only profile imports")
+    args = parser.parse_args()
+    
+    print("📦 Import time (fresh interpreter)")
+    for component, statement in IMPORT_COMPONENTS:
+        seconds = measure_import(statement)
+        print(f"  {component:<24} {'not installed' if seconds is None else f'{seconds:.2f}s'}")
+    
+    if not args.skip_models:
+        print("🧠 Load time")
+        for component, seconds in measure_model_loads().items():
+            print(f"  {component:<24} {seconds:.2f}s")
+        
+        from residency import process_memory
+        memory = process_memory()
+        if memory["rss_mb"] is not None:
+            print("💾 Memory after load")
+            for field in ("rss_mb", "pss_mb", "shared_mb"):
+                if memory[field] is not None:
+                    print(f"  {field[:-3].upper():<24} {memory[field]:.0f} MiB")
+
+if __name__ == "__main__":
+    main()
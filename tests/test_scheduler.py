@@ -0,0 +1,103 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scheduler import GenerationScheduler
+
+class RecordingGenerator:
+    """Pipeline stand-in that records every batch it is called with"""
+
+    def __init__(self, error=None, gate=None):
+        self.calls = []
+        self.error = error
+        self.gate = gate
+
+    def __call__(self, prompts, **kwargs):
+        if self.gate is not None:
+            self.gate.wait()
+        self.calls.append((list(prompts), kwargs))
+        if self.error is not None:
+            raise self.error
+        return [[{"generated_text": prompt.upper()}] for prompt in prompts]
+
+@pytest.fixture
+def make_scheduler():
+    schedulers = []
+
+    def make(generator, **kwargs):
+        scheduler = GenerationScheduler(generator, **kwargs)
+        schedulers.append(scheduler)
+        return scheduler
+
+    yield make
+    for scheduler in schedulers:
+        if scheduler._running:
+            scheduler.shutdown()
+
+def test_flushes_when_batch_is_full(make_scheduler):
+    generator = RecordingGenerator()
+    # A wait far longer than the test proves the flush came from the batch size
+    scheduler = make_scheduler(generator, max_batch_size=4, max_wait_ms=60000)
+    start = time.perf_counter()
+    futures = [scheduler.submit(f"p{i}") for i in range(4)]
+    assert [future.result(timeout=5) for future in futures] == ["P0", "P1", "P2", "P3"]
+    assert time.perf_counter() - start < 5
+    assert [prompts for prompts, _ in generator.calls] == [["p0", "p1", "p2", "p3"]]
+    assert generator.calls[0][1]["batch_size"] == 4
+
+def test_flushes_partial_batch_after_max_wait(make_scheduler):
+    generator = RecordingGenerator()
+    scheduler = make_scheduler(generator, max_batch_size=100, max_wait_ms=50)
+    start = time.perf_counter()
+    futures = [scheduler.submit(f"p{i}") for i in range(3)]
+    assert [future.result(timeout=5) for future in futures] == ["P0", "P1", "P2"]
+    assert time.perf_counter() - start >= 0.04
+    assert [prompts for prompts, _ in generator.calls] == [["p0", "p1", "p2"]]
+
+def test_generator_error_reaches_every_future(make_scheduler):
+    generator = RecordingGenerator(error=RuntimeError("out of memory"))
+    scheduler = make_scheduler(generator, max_batch_size=3, max_wait_ms=50)
+    futures = [scheduler.submit(f"p{i}") for i in range(3)]
+    for future in futures:
+        with pytest.raises(RuntimeError, match="out of memory"):
+            future.result(timeout=5)
+
+def test_different_generation_kwargs_never_share_a_batch(make_scheduler):
+    generator = RecordingGenerator()
+    scheduler = make_scheduler(generator, max_batch_size=8, max_wait_ms=50)
+    futures = [
+        scheduler.submit("a", max_length=10),
+        scheduler.submit("b", max_length=20),
+        scheduler.submit("c", max_length=10),
+        scheduler.submit("d", max_length=20, do_sample=True),
+    ]
+    assert [future.result(timeout=5) for future in futures] == ["A", "B", "C", "D"]
+    batches = {
+        tuple(sorted((k, v) for k, v in kwargs.items() if k != "batch_size")): prompts
+        for prompts, kwargs in generator.calls
+    }
+    assert batches == {
+        (("max_length", 10),): ["a", "c"],
+        (("max_length", 20),): ["b"],
+        (("do_sample", True), ("max_length", 20)): ["d"],
+    }
+
+def test_shutdown_drains_queued_prompts(make_scheduler):
+    gate = threading.Event()
+    generator = RecordingGenerator(gate=gate)
+    scheduler = make_scheduler(generator, max_batch_size=2, max_wait_ms=10)
+    futures = [scheduler.submit(f"p{i}") for i in range(5)]
+    # Hold the first batch in the generator so the rest is still queued at shutdown
+    stopper = threading.Thread(target=scheduler.shutdown)
+    stopper.start()
+    gate.set()
+    stopper.join(timeout=5)
+    assert not stopper.is_alive()
+    assert [future.result(timeout=0) for future in futures] == ["P0", "P1", "P2", "P3", "P4"]
+    with pytest.raises(RuntimeError):
+        scheduler.submit("late")